@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Generate synthetic registries in the config/registry.json schema"""
+
+import argparse
+import json
+import random
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+STUB_MCP = Path(__file__).parent / "stub_mcp.py"
+
+VERBS = [
+    "create", "list", "delete", "update", "search", "generate", "read", "write",
+    "analyze", "export", "import", "sync", "deploy", "monitor", "render", "convert",
+    "summarize", "translate", "schedule", "archive", "validate", "compare", "merge", "tag"
+]
+
+NOUNS = [
+    "image", "logo", "repository", "branch", "issue", "container", "volume", "file",
+    "directory", "invoice", "expense", "report", "memory", "entity", "relation", "timezone",
+    "calendar", "email", "message", "document", "spreadsheet", "database", "table", "query",
+    "model", "workflow", "ticket", "customer", "payment", "video", "audio", "note",
+    "task", "project", "secret", "certificate", "cluster", "metric", "alert", "log"
+]
+
+DOMAINS = [
+    "cloud", "finance", "media", "devops", "knowledge", "productivity", "security",
+    "analytics", "communication", "storage", "design", "research"
+]
+
+def _phrase(rng: random.Random) -> str:
+    return f"{rng.choice(VERBS)} {rng.choice(NOUNS)}"
+
+def generate_registry(num_tools: int,
+                      tools_per_mcp: int = 20,
+                      seed: int = 0,
+                      command: Optional[str] = None,
+                      args: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Build a deterministic registry with ``num_tools`` tools spread over MCPs"""
+    rng = random.Random(seed)
+    command = command or sys.executable
+    args = args if args is not None else [str(STUB_MCP)]
+
+    mcps: Dict[str, Any] = {}
+    remaining = num_tools
+    index = 0
+    while remaining > 0:
+        domain = rng.choice(DOMAINS)
+        nouns = rng.sample(NOUNS, 4)
+        count = min(tools_per_mcp, remaining)
+
+        tools = {}
+        for t in range(count):
+            verb, noun = rng.choice(VERBS), rng.choice(nouns)
+            tools[f"{verb}_{noun}_{t}"] = {
+                "description": f"{verb.capitalize()} a {noun} in the {domain} service",
+                "examples": [_phrase(rng), f"{verb} my {noun}"],
+                "parameters": {
+                    noun: {"description": f"The {noun} to {verb}"}
+                }
+            }
+
+        mcps[f"{domain}_{index}"] = {
+            "description": f"{domain.capitalize()} service for {', '.join(nouns)}",
+            "capabilities": [f"{rng.choice(VERBS)} {noun}" for noun in nouns],
+            "keywords": [domain] + nouns,
+            "command": command,
+            "args": list(args),
+            "tools": tools
+        }
+        remaining -= count
+        index += 1
+
+    return {"mcps": mcps}
+
+def generate_queries(num_queries: int, seed: int = 1) -> List[str]:
+    """Natural-language-ish queries over the same vocabulary"""
+    rng = random.Random(seed)
+    templates = [
+        "I need to {verb} a {noun}",
+        "please {verb} the {noun}",
+        "{verb} {noun} for my {domain} project",
+        "how do I {verb} {noun}s",
+    ]
+    return [
+        rng.choice(templates).format(verb=rng.choice(VERBS), noun=rng.choice(NOUNS),
+                                     domain=rng.choice(DOMAINS))
+        for _ in range(num_queries)
+    ]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("num_tools", type=int, help="Total number of tools (e.g. 10 to 50000)")
+    parser.add_argument("-o", "--output", help="Write to this file instead of stdout")
+    parser.add_argument("--tools-per-mcp", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--command", help="Child MCP command (default: this Python)")
+    parser.add_argument("--args", nargs="*", help="Child MCP args (default: stub_mcp.py)")
+    opts = parser.parse_args()
+
+    registry = generate_registry(opts.num_tools, opts.tools_per_mcp, opts.seed,
+                                 opts.command, opts.args)
+    text = json.dumps(registry, indent=2)
+    if opts.output:
+        Path(opts.output).write_text(text)
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""Reproducible, offline benchmark suite for the orchestrator.
+
+Starts the stub embedding server, generates synthetic registries and runs
+every scenario in a fresh worker process so startup time and peak RSS are
+measured in isolation. Results are printed (or written) as JSON; pass
+``--compare old.json`` to print the relative change of every metric.
+
+    python benchmarks/run_benchmarks.py --sizes 10,1000,50000 -o results.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+BENCH_DIR = Path(__file__).parent
+REPO_ROOT = BENCH_DIR.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from gen_registry import STUB_MCP, generate_registry, generate_queries  # noqa: E402
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+def summarize(latencies: List[float], elapsed: float) -> Dict[str, float]:
+    return {
+        "count": len(latencies),
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "max_ms": max(latencies) * 1000 if latencies else 0.0,
+        "throughput_per_s": len(latencies) / elapsed if elapsed else 0.0
+    }
+
+def peak_rss_kb() -> int:
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes on Linux
+    return usage // 1024 if sys.platform == "darwin" else usage
+
+def stage_summary() -> Dict[str, Any]:
+    from mcp_orchestrator.metrics import metrics
+    return {
+        stage: {"count": h["count"], "mean_ms": h["mean"] * 1000, "p99_ms": h["p99"] * 1000}
+        for stage, h in metrics.snapshot()["stages"].items()
+    }
+
+# ---------------------------------------------------------------------------
+# Workers (run in their own process)
+# ---------------------------------------------------------------------------
+
+async def _routing_worker(opts) -> Dict[str, Any]:
+    t0 = time.perf_counter()
+    from mcp_orchestrator.orchestrator import MCPOrchestrator
+    import_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    orchestrator = MCPOrchestrator(registry_path=opts.registry, lm_studio_url=opts.lm_studio_url,
+                                   precision=opts.precision)
+    startup_s = time.perf_counter() - t0
+
+    queries = generate_queries(opts.queries, seed=opts.seed)
+    results = {}
+    for phase in ("cold", "warm"):
+        latencies = []
+        start = time.perf_counter()
+        for query in queries:
+            t0 = time.perf_counter()
+            await orchestrator.find_tools(query, threshold=opts.threshold)
+            latencies.append(time.perf_counter() - t0)
+        results[phase] = summarize(latencies, time.perf_counter() - start)
+
+    # Plans of 10 unseen steps routed with one find_tools_batch call each
+    plan_queries = generate_queries(opts.queries, seed=opts.seed + 1)
+    latencies = []
+    start = time.perf_counter()
+    for i in range(0, len(plan_queries), 10):
+        t0 = time.perf_counter()
+        await orchestrator.find_tools_batch(plan_queries[i:i + 10], threshold=opts.threshold)
+        latencies.append(time.perf_counter() - t0)
+    results["batch10"] = summarize(latencies, time.perf_counter() - start)
+
+    return {
+        "scenario": "routing",
+        "tools": opts.tools,
+        "precision": opts.precision,
+        "import_s": import_s,
+        "startup_s": startup_s,
+        "find_tools": results,
+        "index": orchestrator.describe_index(),
+        "recall": _recall_vs_float64(orchestrator, queries),
+        "precisions": _precision_costs(orchestrator, queries),
+        "stages": stage_summary(),
+        "peak_rss_kb": peak_rss_kb()
+    }
+
+def _recall_vs_float64(orchestrator, queries: List[str], k: int = 10) -> Dict[str, float]:
+    """Top-k agreement of the tool index with exact float64 scoring"""
+    from mcp_orchestrator.index import measure_recall
+    from stub_embedding_server import StubEmbedder
+
+    # The stub is deterministic, so this rebuilds exactly what the server returned
+    embedder = StubEmbedder(orchestrator.tool_embeddings.dim or 768)
+    reference = [embedder.embed(text) for _, text in orchestrator.tool_texts()]
+    return measure_recall(reference, orchestrator.tool_embeddings,
+                          [embedder.embed(q) for q in queries], k)
+
+def _precision_costs(orchestrator, queries: List[str], k: int = 10) -> Dict[str, Dict[str, float]]:
+    """Memory, scoring latency and recall of the tool index at every precision"""
+    from mcp_orchestrator.index import PRECISIONS, EmbeddingMatrix, measure_recall
+    from stub_embedding_server import StubEmbedder
+
+    embedder = StubEmbedder(orchestrator.tool_embeddings.dim or 768)
+    texts = orchestrator.tool_texts()
+    keys = [key for key, _ in texts]
+    reference = [embedder.embed(text) for _, text in texts]
+    vectors = [embedder.embed(q) for q in queries]
+
+    costs = {}
+    for precision in PRECISIONS:
+        matrix = EmbeddingMatrix(keys, reference, precision)
+        latencies = []
+        for vector in vectors:
+            t0 = time.perf_counter()
+            matrix.scores(vector)
+            latencies.append(time.perf_counter() - t0)
+        recall = measure_recall(reference, matrix, vectors, k)
+        costs[precision] = {
+            "bytes": matrix.nbytes,
+            "score_p50_ms": percentile(latencies, 0.50) * 1000,
+            "score_p99_ms": percentile(latencies, 0.99) * 1000,
+            "recall": recall["recall"],
+            "recall_delta": recall["recall_delta"]
+        }
+    return costs
+
+async def _proxy_worker(opts) -> Dict[str, Any]:
+    from mcp_orchestrator.connection import MCPConnectionPool
+
+    config = {
+        "command": sys.executable,
+        "args": [str(STUB_MCP), "--latency-ms", str(opts.child_latency_ms),
+                 "--payload-bytes", str(opts.payload_bytes)]
+    }
+    pool = MCPConnectionPool()
+
+    t0 = time.perf_counter()
+    connection = await pool.get_connection("stub", config)
+    connect_s = time.perf_counter() - t0
+
+    levels = {}
+    try:
+        for concurrency in opts.concurrency:
+            latencies: List[float] = []
+            remaining = opts.calls
+
+            async def client():
+                nonlocal remaining
+                while remaining > 0:
+                    remaining -= 1
+                    t = time.perf_counter()
+                    await connection.call_tool("tool_0", {})
+                    latencies.append(time.perf_counter() - t)
+
+            start = time.perf_counter()
+            await asyncio.gather(*(client() for _ in range(concurrency)))
+            levels[str(concurrency)] = summarize(latencies, time.perf_counter() - start)
+    finally:
+        await pool.close_all()
+
+    return {
+        "scenario": "proxy",
+        "child_latency_ms": opts.child_latency_ms,
+        "payload_bytes": opts.payload_bytes,
+        "connect_s": connect_s,
+        "concurrency": levels,
+        "stages": stage_summary(),
+        "peak_rss_kb": peak_rss_kb()
+    }
+
+def run_worker(opts):
+    worker = _routing_worker if opts.worker == "routing" else _proxy_worker
+    print(json.dumps(asyncio.run(worker(opts))))
+
+# ---------------------------------------------------------------------------
+# Driver
+# ---------------------------------------------------------------------------
+
+def handshake_benchmark(registry_path: Path, tools: int, url: str) -> Dict[str, Any]:
+    """Time `python -m mcp_orchestrator` from spawn to initialize and tools/list"""
+    env = dict(os.environ,
+               MCP_ORCHESTRATOR_REGISTRY=str(registry_path),
+               MCP_ORCHESTRATOR_LM_STUDIO_URL=url,
+               PYTHONPATH=os.pathsep.join(filter(None, [str(REPO_ROOT), os.environ.get("PYTHONPATH")])))
+
+    def rpc(proc, request_id: int, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        proc.stdin.write(json.dumps({"jsonrpc": "2.0", "id": request_id,
+                                     "method": method, "params": params}) + "\n")
+        proc.stdin.flush()
+        while True:
+            message = json.loads(proc.stdout.readline())
+            if message.get("id") == request_id:
+                return message
+
+    t0 = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "-m", "mcp_orchestrator"], env=env, text=True,
+                            stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                            stderr=subprocess.DEVNULL)
+    try:
+        rpc(proc, 1, "initialize", {
+            "protocolVersion": "2024-11-05",
+            "capabilities": {},
+            "clientInfo": {"name": "benchmark", "version": "0.1.0"}
+        })
+        initialize_ms = (time.perf_counter() - t0) * 1000
+        proc.stdin.write(json.dumps({"jsonrpc": "2.0", "method": "notifications/initialized"}) + "\n")
+        proc.stdin.flush()
+
+        rpc(proc, 2, "tools/list", {})
+        list_tools_ms = (time.perf_counter() - t0) * 1000
+
+        t1 = time.perf_counter()
+        rpc(proc, 3, "tools/call", {"name": "find_tool", "arguments": {"query": "create a logo"}})
+        first_find_tool_ms = (time.perf_counter() - t1) * 1000
+    finally:
+        proc.terminate()
+        proc.wait()
+
+    return {
+        "scenario": "handshake",
+        "tools": tools,
+        "initialize_ms": initialize_ms,
+        "list_tools_ms": list_tools_ms,
+        "first_find_tool_ms": first_find_tool_ms
+    }
+
+def _spawn_worker(args: List[str]) -> Dict[str, Any]:
+    cmd = [sys.executable, str(Path(__file__).resolve())] + args
+    t0 = time.perf_counter()
+    proc = subprocess.run(cmd, capture_output=True, text=True, check=True)
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["process_wall_s"] = time.perf_counter() - t0
+    return result
+
+def _flatten(data: Any, prefix: str = "") -> Dict[str, float]:
+    flat = {}
+    if isinstance(data, dict):
+        for key, value in data.items():
+            flat.update(_flatten(value, f"{prefix}.{key}" if prefix else str(key)))
+    elif isinstance(data, (int, float)) and not isinstance(data, bool):
+        flat[prefix] = float(data)
+    return flat
+
+def _result_key(result: Dict[str, Any]) -> str:
+    if result["scenario"] == "routing":
+        return f"routing[{result['tools']},{result['precision']}]"
+    if result["scenario"] == "handshake":
+        return f"{result['scenario']}[{result['tools']}]"
+    return "proxy"
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any]):
+    """Print the relative change of every shared numeric metric"""
+    old = {_result_key(r): _flatten(r) for r in baseline["results"]}
+    for result in current["results"]:
+        key = _result_key(result)
+        if key not in old:
+            continue
+        for name, value in _flatten(result).items():
+            before = old[key].get(name)
+            if before:
+                print(f"{key}.{name}: {before:.4g} -> {value:.4g} ({(value - before) / before:+.1%})")
+
+def run_suite(opts) -> Dict[str, Any]:
+    embed_cmd = [sys.executable, str(BENCH_DIR / "stub_embedding_server.py"),
+                 "--latency-ms", str(opts.embed_latency_ms)]
+    embed_server = subprocess.Popen(embed_cmd, stdout=subprocess.PIPE, text=True)
+    try:
+        port = int(embed_server.stdout.readline())
+        url = f"http://127.0.0.1:{port}"
+
+        results = []
+        with tempfile.TemporaryDirectory() as tmp:
+            for size in opts.sizes:
+                registry_path = Path(tmp) / f"registry_{size}.json"
+                registry_path.write_text(json.dumps(generate_registry(size, seed=opts.seed)))
+                print(f"routing benchmark: {size} tools", file=sys.stderr)
+                results.append(_spawn_worker([
+                    "--worker", "routing", "--registry", str(registry_path),
+                    "--tools", str(size), "--lm-studio-url", url,
+                    "--queries", str(opts.queries), "--threshold", str(opts.threshold),
+                    "--seed", str(opts.seed), "--precision", opts.precision
+                ]))
+                results.append(handshake_benchmark(registry_path, size, url))
+
+        if opts.calls:
+            print("proxy benchmark", file=sys.stderr)
+            results.append(_spawn_worker([
+                "--worker", "proxy", "--calls", str(opts.calls),
+                "--concurrency", ",".join(map(str, opts.concurrency)),
+                "--child-latency-ms", str(opts.child_latency_ms),
+                "--payload-bytes", str(opts.payload_bytes)
+            ]))
+    finally:
+        embed_server.terminate()
+        embed_server.wait()
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "options": {
+                "sizes": opts.sizes, "queries": opts.queries, "calls": opts.calls,
+                "concurrency": opts.concurrency, "child_latency_ms": opts.child_latency_ms,
+                "payload_bytes": opts.payload_bytes, "embed_latency_ms": opts.embed_latency_ms,
+                "precision": opts.precision,
+                "seed": opts.seed
+            }
+        },
+        "results": results
+    }
+
+def _int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v]
+
+def main():
+    parser = argparse.ArgumentParser(description="MCP Orchestrator benchmarks")
+    parser.add_argument("--sizes", type=_int_list, default=[10, 100, 1000],
+                        help="Comma-separated registry sizes in tools (10 to 50000)")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--threshold", type=float, default=0.5)
+    parser.add_argument("--calls", type=int, default=2000,
+                        help="Proxy calls per concurrency level (0 skips the proxy benchmark)")
+    parser.add_argument("--concurrency", type=_int_list, default=[1, 8, 32])
+    parser.add_argument("--child-latency-ms", type=float, default=1.0)
+    parser.add_argument("--payload-bytes", type=int, default=1024)
+    parser.add_argument("--embed-latency-ms", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--precision", default="float32",
+                        choices=["float64", "float32", "float16", "int8"],
+                        help="Storage precision of the routing index")
+    parser.add_argument("-o", "--output", help="Write JSON results to this file")
+    parser.add_argument("--compare", help="Baseline JSON results to compare against")
+
+    # Internal: worker mode
+    parser.add_argument("--worker", choices=["routing", "proxy"], help=argparse.SUPPRESS)
+    parser.add_argument("--registry", help=argparse.SUPPRESS)
+    parser.add_argument("--tools", type=int, default=0, help=argparse.SUPPRESS)
+    parser.add_argument("--lm-studio-url", help=argparse.SUPPRESS)
+    opts = parser.parse_args()
+
+    if opts.worker:
+        run_worker(opts)
+        return
+
+    report = run_suite(opts)
+    text = json.dumps(report, indent=2)
+    if opts.output:
+        Path(opts.output).write_text(text)
+    else:
+        print(text)
+
+    if opts.compare:
+        compare(json.loads(Path(opts.compare).read_text()), report)
+
+if __name__ == "__main__":
+    main()
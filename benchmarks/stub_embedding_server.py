@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Offline stand-in for the LM Studio /v1/embeddings endpoint.
+
+Embeddings are deterministic bag-of-words vectors: every token maps to a
+fixed pseudo-random direction, so texts sharing words score as similar and
+routing results are reproducible across runs.
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict
+
+import numpy as np
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+class StubEmbedder:
+    """Deterministic hashed bag-of-words embedder"""
+
+    def __init__(self, dim: int = 768):
+        self.dim = dim
+        self.token_vectors: Dict[str, np.ndarray] = {}
+
+    def _token_vector(self, token: str) -> np.ndarray:
+        vector = self.token_vectors.get(token)
+        if vector is None:
+            seed = int.from_bytes(hashlib.md5(token.encode()).digest()[:8], "little")
+            vector = np.random.default_rng(seed).standard_normal(self.dim)
+            self.token_vectors[token] = vector
+        return vector
+
+    def embed(self, text: str) -> list:
+        vector = np.zeros(self.dim)
+        for token in TOKEN_RE.findall(text.lower()):
+            vector += self._token_vector(token)
+        norm = np.linalg.norm(vector)
+        if norm:
+            vector /= norm
+        return vector.tolist()
+
+def make_handler(embedder: StubEmbedder, latency: float):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            if self.path.rstrip("/") != "/v1/embeddings":
+                self.send_error(404)
+                return
+
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            inputs = payload.get("input", "")
+            if isinstance(inputs, str):
+                inputs = [inputs]
+
+            if latency:
+                time.sleep(latency)
+
+            body = json.dumps({
+                "object": "list",
+                "model": payload.get("model", "stub"),
+                "data": [
+                    {"object": "embedding", "index": i, "embedding": embedder.embed(text)}
+                    for i, text in enumerate(inputs)
+                ]
+            }).encode()
+
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+def main():
+    parser = argparse.ArgumentParser(description="Stub embedding server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0, help="0 picks a free port")
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--latency-ms", type=float, default=0.0,
+                        help="Artificial delay added to every request")
+    opts = parser.parse_args()
+
+    handler = make_handler(StubEmbedder(opts.dim), opts.latency_ms / 1000.0)
+    httpd = ThreadingHTTPServer((opts.host, opts.port), handler)
+    httpd.daemon_threads = True
+
+    # The runner reads the bound port from the first line of stdout
+    print(httpd.server_address[1], flush=True)
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Minimal stdio child MCP with configurable latency and payload size.
+
+Speaks just enough JSON-RPC for MCPConnection: ``initialize``,
+``tools/list`` and ``tools/call``. Requests are answered concurrently, so
+latency overlaps the way it would in a real asynchronous server.
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+
+def main():
+    parser = argparse.ArgumentParser(description="Stub stdio MCP server")
+    parser.add_argument("--latency-ms", type=float, default=0.0,
+                        help="Delay before answering tools/call")
+    parser.add_argument("--payload-bytes", type=int, default=64,
+                        help="Size of the text returned by tools/call")
+    parser.add_argument("--startup-ms", type=float, default=0.0,
+                        help="Delay before answering initialize (simulates imports)")
+    parser.add_argument("--tools", type=int, default=3)
+    opts = parser.parse_args()
+
+    write_lock = threading.Lock()
+    payload = "x" * opts.payload_bytes
+    tools = [
+        {"name": f"tool_{i}", "description": f"Stub tool {i}",
+         "inputSchema": {"type": "object", "properties": {}}}
+        for i in range(opts.tools)
+    ]
+
+    def reply(request_id, result, delay: float = 0.0):
+        if delay:
+            time.sleep(delay)
+        line = json.dumps({"jsonrpc": "2.0", "id": request_id, "result": result}) + "\n"
+        with write_lock:
+            sys.stdout.write(line)
+            sys.stdout.flush()
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        if "id" not in request:
+            # Notification, nothing to answer
+            continue
+
+        method = request.get("method")
+        if method == "initialize":
+            reply(request["id"], {
+                "protocolVersion": request.get("params", {}).get("protocolVersion", "0.1.0"),
+                "capabilities": {"tools": {}},
+                "serverInfo": {"name": "stub-mcp", "version": "0.1.0"}
+            }, opts.startup_ms / 1000.0)
+        elif method == "tools/list":
+            reply(request["id"], {"tools": tools})
+        elif method == "tools/call":
+            result = {"content": [{"type": "text", "text": payload}]}
+            if opts.latency_ms:
+                threading.Thread(
+                    target=reply, args=(request["id"], result, opts.latency_ms / 1000.0),
+                    daemon=True
+                ).start()
+            else:
+                reply(request["id"], result)
+        else:
+            with write_lock:
+                sys.stdout.write(json.dumps({
+                    "jsonrpc": "2.0", "id": request["id"],
+                    "error": {"code": -32601, "message": f"Method not found: {method}"}
+                }) + "\n")
+                sys.stdout.flush()
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,15 @@
 """MCP Orchestrator - The ONE MCP to rule them all"""
 
-from .orchestrator import MCPOrchestrator
-from .server import main
-
 __version__ = "0.1.0"
-__all__ = ["MCPOrchestrator", "main"]
\ No newline at end of file
+__all__ = ["MCPOrchestrator", "main"]
+
+def __getattr__(name):
+    # Imported lazily so `python -m mcp_orchestrator` does not pull in numpy
+    # and requests before the server has answered the MCP handshake
+    if name == "MCPOrchestrator":
+        from .orchestrator import MCPOrchestrator
+        return MCPOrchestrator
+    if name == "main":
+        from .server import main
+        return main
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,8 +1,28 @@
 #!/usr/bin/env python3
 """Entry point for running mcp_orchestrator as a module."""
 
+import argparse
 import asyncio
-from .server import main
+
+def parse_args():
+    parser = argparse.ArgumentParser(prog="python -m mcp_orchestrator")
+    parser.add_argument("--transport", choices=["stdio", "http"], default="stdio",
+                        help="stdio (one client per process) or http (many clients)")
+    parser.add_argument("--host", default="127.0.0.1", help="HTTP bind address")
+    parser.add_argument("--port", type=int, default=8765, help="HTTP port")
+    parser.add_argument("--uds", help="Serve HTTP on this Unix socket instead of TCP")
+    parser.add_argument("--max-sessions", type=int, default=64,
+                        help="Concurrent client sessions allowed in http mode")
+    parser.add_argument("--max-concurrent", type=int, default=32,
+                        help="In-flight requests allowed in http mode before rejecting")
+    return parser.parse_args()
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    args = parse_args()
+    if args.transport == "http":
+        from .http_server import serve_http
+        asyncio.run(serve_http(args.host, args.port, args.uds,
+                               args.max_sessions, args.max_concurrent))
+    else:
+        from .server import main
+        asyncio.run(main())
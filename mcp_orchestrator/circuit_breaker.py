@@ -0,0 +1,65 @@
+"""Circuit breaker for the remote embedding endpoint"""
+
+import time
+import threading
+from typing import Any, Dict
+
+class CircuitBreaker:
+    """Stops calling an endpoint after repeated failures.
+
+    ``closed``: calls go through. After ``failure_threshold`` consecutive
+    failures the breaker turns ``open`` and refuses calls for
+    ``reset_timeout`` seconds. Then it is ``half_open``: one probe call is
+    let through, and its outcome closes or re-opens the breaker. Safe to
+    use from the worker threads that make the embedding requests.
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 10.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+        self.trips = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.failures < self.failure_threshold:
+            return "closed"
+        if time.monotonic() - self.opened_at < self.reset_timeout:
+            return "open"
+        return "half_open"
+
+    def allow(self) -> bool:
+        """Whether a call may be attempted now"""
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half_open" and not self.probing:
+                self.probing = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self.probing = False
+            if self.failures >= self.failure_threshold:
+                if self.failures == self.failure_threshold:
+                    self.trips += 1
+                # Opening, or a failed half-open probe: wait a full period again
+                self.opened_at = time.monotonic()
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "trips": self.trips
+        }
@@ -2,16 +2,183 @@
 """MCP Connection Manager - Handles communication with child MCP servers."""
 
 import asyncio
+import heapq
+import itertools
 import json
 import logging
+import math
 import subprocess
+import time
+from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 import os
 import sys
 
+from .metrics import metrics, Histogram
+from .tracing import tracer
+
 logger = logging.getLogger("mcp-orchestrator.connection")
 
+# Waiters with a lower rank are admitted first
+PRIORITIES = {"interactive": 0, "batch": 1}
+
+class MCPOverloaded(Exception):
+    """Raised when a child's wait queue is full; carries a retry-after hint."""
+    
+    def __init__(self, name: str, reason: str, retry_after: float):
+        super().__init__(f"MCP server {name} is overloaded ({reason}), retry after {retry_after:.1f}s")
+        self.name = name
+        self.reason = reason
+        self.retry_after = retry_after
+        
+class AdmissionGate:
+    """Per-MCP concurrency limit with a bounded, prioritised wait queue.
+    
+    At most ``max_concurrent`` requests are in flight to the child; up to
+    ``max_queue`` more wait, interactive ones ahead of batch ones. A full
+    queue rejects at once with :class:`MCPOverloaded` instead of letting
+    work pile up behind a slow child, and an interactive arrival displaces
+    the newest queued batch request. ``queue_timeout`` bounds how long a
+    request may wait for a slot.
+    """
+    
+    def __init__(self,
+                 name: str,
+                 max_concurrent: int,
+                 max_queue: int = 64,
+                 queue_timeout: Optional[float] = None,
+                 min_retry_after: float = 0.5):
+        self.name = name
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.min_retry_after = min_retry_after
+        self.in_flight = 0
+        self.waiters: List[list] = []
+        self.order = itertools.count()
+        self.wait_times = Histogram()
+        # Moving average of time spent holding a slot, for retry-after hints
+        self.service_time = 0.0
+        self.rejected = 0
+        self.shed = 0
+        
+    @classmethod
+    def from_config(cls, name: str, config: Dict[str, Any]) -> Optional["AdmissionGate"]:
+        """Gate for a registry entry, or None if it sets no ``max_concurrent``."""
+        if config.get("max_concurrent") is None:
+            return None
+        return cls(
+            name,
+            int(config["max_concurrent"]),
+            max_queue=int(config.get("max_queue", 64)),
+            queue_timeout=config.get("queue_timeout")
+        )
+        
+    @asynccontextmanager
+    async def slot(self, priority: str = "interactive"):
+        """Hold one of the child's request slots for the duration of the block."""
+        with tracer.span("admission", mcp=self.name, priority=priority, queued=len(self.waiters)):
+            await self.acquire(priority)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.service_time = elapsed if not self.service_time else 0.9 * self.service_time + 0.1 * elapsed
+            self.release()
+            
+    async def acquire(self, priority: str = "interactive"):
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority: {priority} (expected one of {', '.join(PRIORITIES)})")
+        rank = PRIORITIES[priority]
+        
+        if self.in_flight < self.max_concurrent and not self.waiters:
+            self.in_flight += 1
+            self._record_wait(0.0)
+            return
+            
+        if len(self.waiters) >= self.max_queue:
+            # Waiters that just timed out or were cancelled remove themselves
+            # only once they run again; they must not hold a place or be shed
+            self._drop_finished()
+        if len(self.waiters) >= self.max_queue:
+            victim = max(self.waiters, default=None)
+            if victim is None or victim[0] <= rank:
+                self.rejected += 1
+                metrics.incr("admission_rejected")
+                raise self._overloaded("queue full")
+            # Make room for a more urgent request by shedding the newest, least urgent one
+            self._remove(victim)
+            self.shed += 1
+            metrics.incr("admission_shed")
+            victim[2].set_exception(self._overloaded("shed for interactive request"))
+            
+        future = asyncio.get_running_loop().create_future()
+        entry = [rank, next(self.order), future]
+        heapq.heappush(self.waiters, entry)
+        start = time.perf_counter()
+        try:
+            if self.queue_timeout is None:
+                await future
+            else:
+                await asyncio.wait_for(future, self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._remove(entry)
+            self.rejected += 1
+            metrics.incr("admission_rejected")
+            raise self._overloaded("queue timeout")
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled() and future.exception() is None:
+                # Granted a slot just as we were cancelled: pass it on
+                self.release()
+            else:
+                self._remove(entry)
+            raise
+        self._record_wait(time.perf_counter() - start)
+        
+    def release(self):
+        """Hand the slot to the most urgent waiter, or free it."""
+        while self.waiters:
+            _, _, future = heapq.heappop(self.waiters)
+            if not future.done():
+                # The slot moves straight to the waiter; in_flight is unchanged
+                future.set_result(None)
+                return
+        self.in_flight -= 1
+        
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queued": len(self.waiters),
+            "rejected": self.rejected,
+            "shed": self.shed,
+            "wait": self.wait_times.snapshot()
+        }
+        
+    def _record_wait(self, seconds: float):
+        self.wait_times.observe(seconds)
+        metrics.observe("admission_wait", seconds)
+        
+    def _drop_finished(self):
+        waiting = [entry for entry in self.waiters if not entry[2].done()]
+        if len(waiting) < len(self.waiters):
+            self.waiters = waiting
+            heapq.heapify(self.waiters)
+            
+    def _remove(self, entry: list):
+        if entry in self.waiters:
+            self.waiters.remove(entry)
+            heapq.heapify(self.waiters)
+            
+    def _overloaded(self, reason: str) -> MCPOverloaded:
+        # Roughly how long until the current backlog drains
+        backlog = (len(self.waiters) + 1) * self.service_time / self.max_concurrent
+        retry_after = math.ceil(max(self.min_retry_after, backlog) * 10) / 10
+        return MCPOverloaded(self.name, reason, retry_after)
+        
 class MCPConnection:
     """Manages a connection to a child MCP server via stdio."""
     
@@ -23,23 +190,32 @@ class MCPConnection:
         self.writer = None
         self.request_id = 0
         self.pending_requests = {}
+        # Optional per-request timeout in seconds from the registry entry
+        self.request_timeout = config.get("timeout")
+        # A child that never answers initialize must not block its caller forever
+        self.initialize_timeout = config.get("initialize_timeout", 30.0)
+        # Set by the pool when max_concurrent is configured for this MCP
+        self.admission: Optional[AdmissionGate] = None
         
     async def connect(self):
         """Start the MCP server process and establish stdio communication."""
         cmd = [self.config["command"]] + self.config.get("args", [])
         
-        # Set up environment with credentials if needed
-        env = os.environ.copy()
+        # Set up environment with credentials if needed. Without extra
+        # variables the child inherits ours, avoiding a copy per spawn.
+        extra_env = self.config.get("env")
+        env = {**os.environ, **extra_env} if extra_env else None
         
         logger.info(f"Starting MCP server: {self.name} with command: {' '.join(cmd)}")
         
-        self.process = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            env=env
-        )
+        with metrics.timer("child_spawn"):
+            self.process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                env=env
+            )
         
         self.reader = self.process.stdout
         self.writer = self.process.stdin
@@ -48,6 +224,16 @@ class MCPConnection:
         asyncio.create_task(self._read_responses())
         
         # Send initialization
+        try:
+            with metrics.timer("child_initialize"):
+                await asyncio.wait_for(self._initialize(), self.initialize_timeout)
+        except BaseException:
+            # Including cancellation: never leave a half-started child behind
+            self.terminate()
+            raise
+    
+    async def _initialize(self):
+        """Perform the MCP initialize handshake."""
         await self._send_request({
             "jsonrpc": "2.0",
             "method": "initialize",
@@ -84,9 +270,21 @@ class MCPConnection:
                         
             except Exception as e:
                 logger.error(f"Error reading from {self.name}: {e}")
+        
+        # The child went away; fail outstanding requests instead of hanging
+        for future in self.pending_requests.values():
+            if not future.done():
+                future.set_exception(ConnectionError(f"MCP server {self.name} exited"))
+        self.pending_requests.clear()
                 
-    async def _send_request(self, request: Dict[str, Any]) -> Any:
+    async def _send_request(self, request: Dict[str, Any], priority: str = "interactive") -> Any:
         """Send a request to the MCP server and wait for response."""
+        if self.admission is None:
+            return await self._roundtrip(request)
+        async with self.admission.slot(priority):
+            return await self._roundtrip(request)
+                
+    async def _roundtrip(self, request: Dict[str, Any]) -> Any:
         self.request_id += 1
         request["id"] = self.request_id
         
@@ -94,13 +292,27 @@ class MCPConnection:
         future = asyncio.Future()
         self.pending_requests[request["id"]] = future
         
-        # Send request
-        request_json = json.dumps(request) + "\n"
-        self.writer.write(request_json.encode())
-        await self.writer.drain()
-        
-        # Wait for response
-        return await future
+        with tracer.span("child_request", mcp=self.name, method=request["method"], rpc_id=request["id"]) as span, \
+                metrics.timer("child_roundtrip"):
+            # Let tracing-aware children join the orchestrator's trace
+            traceparent = span.traceparent()
+            if traceparent:
+                request.setdefault("params", {}).setdefault("_meta", {})["traceparent"] = traceparent
+            
+            # Send request
+            request_json = json.dumps(request) + "\n"
+            self.writer.write(request_json.encode())
+            await self.writer.drain()
+            
+            # Wait for response
+            if self.request_timeout is None:
+                return await future
+            try:
+                return await asyncio.wait_for(future, self.request_timeout)
+            except asyncio.TimeoutError:
+                self.pending_requests.pop(request["id"], None)
+                metrics.incr("child_timeouts")
+                raise
         
     async def list_tools(self) -> List[Dict[str, Any]]:
         """Get list of tools from the MCP server."""
@@ -111,7 +323,7 @@ class MCPConnection:
         })
         return result.get("tools", [])
         
-    async def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Any:
+    async def call_tool(self, tool_name: str, arguments: Dict[str, Any], priority: str = "interactive") -> Any:
         """Call a tool on the MCP server."""
         return await self._send_request({
             "jsonrpc": "2.0",
@@ -120,43 +332,166 @@ class MCPConnection:
                 "name": tool_name,
                 "arguments": arguments
             }
-        })
+        }, priority)
         
+    def is_alive(self) -> bool:
+        """Check whether the child process is still running."""
+        return self.process is not None and self.process.returncode is None
+        
+    def terminate(self):
+        """Stop the child without waiting for it to exit."""
+        if self.process and self.process.returncode is None:
+            self.process.terminate()
+            
     async def disconnect(self):
         """Disconnect from the MCP server."""
-        if self.process:
+        if self.process and self.process.returncode is None:
             self.process.terminate()
             await self.process.wait()
             
+class SpareProcessManager:
+    """Keeps already-initialized child processes ready to hand out.
+    
+    MCPs opt in with ``"spares": N`` in their registry entry. Taking a spare
+    is instant; the pool is refilled in the background, so interpreter
+    start-up, imports and the ``initialize`` handshake stay off the
+    request path when a connection is first needed or a child crashed.
+    """
+    
+    def __init__(self, retry_delay: float = 5.0):
+        self.retry_delay = retry_delay
+        self.targets: Dict[str, tuple] = {}
+        self.spares: Dict[str, List[MCPConnection]] = {}
+        self.refilling: Dict[str, asyncio.Task] = {}
+        
+    def configure(self, name: str, config: Dict[str, Any], count: int):
+        """Keep ``count`` spares of an MCP ready."""
+        self.targets[name] = (config, count)
+        self.spares.setdefault(name, [])
+        self.refill(name)
+        
+    def take(self, name: str) -> Optional[MCPConnection]:
+        """Hand out a live spare, if one is ready, and start refilling."""
+        if name not in self.targets:
+            return None
+            
+        spares = self.spares.get(name, [])
+        while spares:
+            connection = spares.pop()
+            if connection.is_alive():
+                metrics.incr("spare_hits")
+                self.refill(name)
+                return connection
+                
+        metrics.incr("spare_misses")
+        self.refill(name)
+        return None
+        
+    def refill(self, name: str):
+        """Top the spares for an MCP back up in the background."""
+        task = self.refilling.get(name)
+        if task is None or task.done():
+            self.refilling[name] = asyncio.create_task(self._refill(name))
+            
+    async def _refill(self, name: str):
+        config, count = self.targets[name]
+        spares = self.spares[name]
+        
+        while True:
+            spares[:] = [c for c in spares if c.is_alive()]
+            if len(spares) >= count:
+                return
+                
+            connection = MCPConnection(name, config)
+            try:
+                with metrics.timer("spare_spawn"):
+                    await connection.connect()
+            except Exception as e:
+                logger.error(f"Could not start spare for {name}: {e}")
+                await connection.disconnect()
+                # Do not spin on a child that cannot start
+                await asyncio.sleep(self.retry_delay)
+                continue
+            except BaseException:
+                # Cancelled by close_all mid-spawn: do not orphan the child
+                connection.terminate()
+                raise
+            spares.append(connection)
+            
+    async def close_all(self):
+        """Stop refilling and terminate every spare."""
+        tasks = list(self.refilling.values())
+        for task in tasks:
+            task.cancel()
+        # Wait for the cancelled refills so children they were starting are stopped
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.refilling.clear()
+        for spares in self.spares.values():
+            for connection in spares:
+                await connection.disconnect()
+            spares.clear()
+
 class MCPConnectionPool:
     """Manages a pool of MCP connections."""
     
     def __init__(self):
         self.connections: Dict[str, MCPConnection] = {}
         self.connecting: Dict[str, asyncio.Lock] = {}
+        self.spares = SpareProcessManager()
+        # Admission gates outlive connections, so limits hold across restarts
+        self.gates: Dict[str, Optional[AdmissionGate]] = {}
+        
+    def prewarm(self, registry: Dict[str, Any]):
+        """Start spare processes for every MCP with ``spares`` configured."""
+        for name, config in registry.get("mcps", {}).items():
+            if config.get("spares", 0) > 0 and "command" in config:
+                self.spares.configure(name, config, config["spares"])
         
     async def get_connection(self, name: str, config: Dict[str, Any]) -> MCPConnection:
         """Get or create a connection to an MCP server."""
-        if name in self.connections:
-            return self.connections[name]
+        with tracer.span("get_connection", mcp=name) as span:
+            connection = self.connections.get(name)
+            if connection and connection.is_alive():
+                return connection
+            
+            # Ensure we only connect once even with concurrent requests
+            if name not in self.connecting:
+                self.connecting[name] = asyncio.Lock()
             
-        # Ensure we only connect once even with concurrent requests
-        if name not in self.connecting:
-            self.connecting[name] = asyncio.Lock()
+            async with self.connecting[name]:
+                # Check again after acquiring lock
+                connection = self.connections.get(name)
+                if connection and connection.is_alive():
+                    return connection
             
-        async with self.connecting[name]:
-            # Check again after acquiring lock
-            if name in self.connections:
-                return self.connections[name]
+                if connection:
+                    # Child exited since last use, replace it
+                    logger.warning(f"MCP server {name} exited, restarting")
+                    metrics.incr("child_restarts")
+                    del self.connections[name]
+            
+                if config.get("spares", 0) > 0 and name not in self.spares.targets:
+                    self.spares.configure(name, config, config["spares"])
                 
-            # Create new connection
-            connection = MCPConnection(name, config)
-            await connection.connect()
-            self.connections[name] = connection
-            return connection
+                # Use a warm spare if one is ready, otherwise start a new process
+                connection = self.spares.take(name)
+                span.set(source="spare" if connection is not None else "spawn")
+                if connection is None:
+                    connection = MCPConnection(name, config)
+                    await connection.connect()
+                if name not in self.gates:
+                    self.gates[name] = AdmissionGate.from_config(name, config)
+                connection.admission = self.gates[name]
+                self.connections[name] = connection
+                return connection
+                
+    def describe_admission(self) -> Dict[str, Dict[str, Any]]:
+        """Queue depth, in-flight requests and wait times per gated MCP."""
+        return {name: gate.describe() for name, gate in sorted(self.gates.items()) if gate is not None}
             
     async def close_all(self):
         """Close all connections."""
+        await self.spares.close_all()
         for connection in self.connections.values():
             await connection.disconnect()
         self.connections.clear()
@@ -164,8 +499,16 @@ class MCPConnectionPool:
 # Global connection pool
 connection_pool = MCPConnectionPool()
 
-async def execute_on_mcp(mcp_name: str, tool_name: str, arguments: Dict[str, Any], config: Dict[str, Any]) -> Any:
-    """Execute a tool on a specific MCP server."""
+async def execute_on_mcp(mcp_name: str, 
+                         tool_name: str, 
+                         arguments: Dict[str, Any], 
+                         config: Dict[str, Any],
+                         priority: str = "interactive") -> Any:
+    """Execute a tool on a specific MCP server.
+    
+    Batch callers should pass ``priority="batch"`` so interactive calls are
+    admitted ahead of them when the child is saturated.
+    """
     try:
         # Get connection from pool
         connection = await connection_pool.get_connection(mcp_name, config)
@@ -183,9 +526,12 @@ async def execute_on_mcp(mcp_name: str, tool_name: str, arguments: Dict[str, Any
             raise ValueError(f"No suitable tool found in {mcp_name}")
             
         # Call the tool
-        result = await connection.call_tool(tool_name, arguments)
+        result = await connection.call_tool(tool_name, arguments, priority)
         return result
         
+    except MCPOverloaded:
+        # Expected under load; the caller decides when to retry
+        raise
     except Exception as e:
         logger.error(f"Error executing on {mcp_name}: {e}")
         raise
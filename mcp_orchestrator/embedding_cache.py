@@ -0,0 +1,55 @@
+"""Bounded exact-text cache of query embeddings"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+class EmbeddingCache:
+    """Least-recently-used map from query text to its embedding.
+
+    Worker threads fill it while the event loop reads it, so every access
+    takes a lock. Once ``capacity`` texts are cached, storing another
+    evicts the one used least recently.
+    """
+
+    def __init__(self, capacity: int = 4096):
+        self.capacity = capacity
+        self.entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def __contains__(self, text: str) -> bool:
+        with self._lock:
+            return text in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        with self._lock:
+            vector = self.entries.get(text)
+            if vector is not None:
+                self.entries.move_to_end(text)
+            return vector
+
+    def put(self, text: str, vector: np.ndarray):
+        if self.capacity <= 0:
+            return
+        with self._lock:
+            self.entries[text] = vector
+            self.entries.move_to_end(text)
+            while len(self.entries) > self.capacity:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            vectors = list(self.entries.values())
+        return {
+            "entries": len(vectors),
+            "capacity": self.capacity,
+            "bytes": sum(v.nbytes for v in vectors),
+            "evictions": self.evictions
+        }
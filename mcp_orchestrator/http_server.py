@@ -0,0 +1,160 @@
+"""Long-lived network transport: one orchestrator serving many clients.
+
+Exposes the same MCP server over streamable HTTP (``/mcp``) and the older
+SSE transport (``/sse`` + ``/messages/``), bound to localhost or a Unix
+socket. Every client session gets its own MCP session state, while the
+routing index, embedding cache and child connection pool are shared by
+the whole process.
+"""
+
+import json
+import logging
+import contextlib
+from typing import Any, Dict, Optional
+
+from .metrics import metrics
+from .server import server, orchestrator, initialization_options, start_background_tasks
+
+logger = logging.getLogger(__name__)
+
+class ConcurrencyLimit:
+    """ASGI wrapper bounding in-flight MCP messages.
+
+    Only POSTs carry JSON-RPC requests; long-lived GET event streams are
+    passed through so idle sessions do not use up slots. When every slot
+    is busy the request is rejected at once with 503 and a Retry-After
+    hint rather than queueing behind slow calls.
+    """
+
+    def __init__(self, app, limit: int, retry_after: int = 1):
+        self.app = app
+        self.limit = limit
+        self.retry_after = retry_after
+        self.in_flight = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST":
+            await self.app(scope, receive, send)
+            return
+
+        if self.in_flight >= self.limit:
+            metrics.incr("http_rejected")
+            await _send_json(send, 503, {"error": "server busy"},
+                             [(b"retry-after", str(self.retry_after).encode())])
+            return
+
+        self.in_flight += 1
+        try:
+            with metrics.timer("http_request"):
+                await self.app(scope, receive, send)
+        finally:
+            self.in_flight -= 1
+
+class SSESessions:
+    """ASGI endpoint for the SSE transport with a session cap"""
+
+    def __init__(self, transport, max_sessions: int):
+        self.transport = transport
+        self.max_sessions = max_sessions
+        self.active = 0
+
+    async def __call__(self, scope, receive, send):
+        if self.active >= self.max_sessions:
+            metrics.incr("http_rejected")
+            await _send_json(send, 503, {"error": "too many sessions"}, [(b"retry-after", b"5")])
+            return
+
+        self.active += 1
+        metrics.incr("http_sessions")
+        try:
+            async with self.transport.connect_sse(scope, receive, send) as (read_stream, write_stream):
+                await server.run(read_stream, write_stream, initialization_options())
+        finally:
+            self.active -= 1
+
+async def _send_json(send, status: int, body: Dict[str, Any], headers=None):
+    payload = json.dumps(body).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"),
+                    (b"content-length", str(len(payload)).encode())] + list(headers or [])
+    })
+    await send({"type": "http.response.body", "body": payload})
+
+def create_app(max_sessions: int = 64,
+               max_concurrent: int = 32,
+               session_idle_timeout: float = 1800.0):
+    """Build the Starlette application serving the orchestrator"""
+    from starlette.applications import Starlette
+    from starlette.responses import JSONResponse
+    from starlette.routing import Mount, Route
+    from mcp.server.sse import SseServerTransport
+    from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+
+    # Needs mcp >= 1.30, the first release with both limits (see the http extra)
+    session_manager = StreamableHTTPSessionManager(
+        app=server,
+        max_sessions=max_sessions,
+        session_idle_timeout=session_idle_timeout
+    )
+    sse = SseServerTransport("/messages/")
+    sse_sessions = SSESessions(sse, max_sessions)
+
+    async def handle_streamable(scope, receive, send):
+        await session_manager.handle_request(scope, receive, send)
+
+    async def health(request):
+        # A finished but failed build leaves routing on keyword matches for good
+        status = {
+            "status": "ok" if orchestrator.error is None else "degraded",
+            "index_ready": orchestrator.orchestrator is not None,
+            "sse_sessions": sse_sessions.active,
+            "in_flight": limited_streamable.in_flight + limited_messages.in_flight
+        }
+        if orchestrator.error is not None:
+            status["index_error"] = f"{type(orchestrator.error).__name__}: {orchestrator.error}"
+        return JSONResponse(status)
+
+    limited_streamable = ConcurrencyLimit(handle_streamable, max_concurrent)
+    limited_messages = ConcurrencyLimit(sse.handle_post_message, max_concurrent)
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        start_background_tasks()
+        async with session_manager.run():
+            yield
+
+    return Starlette(
+        routes=[
+            Route("/mcp", endpoint=limited_streamable, methods=["GET", "POST", "DELETE"]),
+            Route("/sse", endpoint=sse_sessions, methods=["GET"]),
+            Mount("/messages/", app=limited_messages),
+            Route("/health", endpoint=health, methods=["GET"])
+        ],
+        lifespan=lifespan
+    )
+
+async def serve_http(host: str = "127.0.0.1",
+                     port: int = 8765,
+                     uds: Optional[str] = None,
+                     max_sessions: int = 64,
+                     max_concurrent: int = 32):
+    """Serve the orchestrator over HTTP until cancelled"""
+    import uvicorn
+
+    if uds is None and host not in ("127.0.0.1", "localhost", "::1"):
+        logger.warning(f"Binding to {host}: the orchestrator has no authentication")
+
+    app = create_app(max_sessions=max_sessions, max_concurrent=max_concurrent)
+    config = uvicorn.Config(
+        app,
+        host=host,
+        port=port,
+        uds=uds,
+        log_level="warning",
+        lifespan="on"
+    )
+    where = uds or f"http://{host}:{port}"
+    logger.info(f"MCP Orchestrator listening on {where} (streamable HTTP at /mcp, SSE at /sse)")
+    await uvicorn.Server(config).serve()
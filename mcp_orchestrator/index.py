@@ -0,0 +1,136 @@
+"""Compact embedding matrices for the routing index"""
+
+import numpy as np
+from typing import Dict, List, Optional
+
+PRECISIONS = ("float64", "float32", "float16", "int8")
+
+# Rows of a float16/int8 matrix cast to float32 at a time while scoring.
+# Casting the whole matrix would allocate a full float32 copy per call.
+SCORE_BLOCK_ROWS = 1024
+
+class EmbeddingMatrix:
+    """Row-normalised embeddings stored at a configurable precision.
+
+    Rows are L2-normalised before quantization, so cosine similarity is a
+    single matrix-vector product. ``int8`` keeps one float32 scale per row
+    (max |x| / 127) and multiplies it back into the scores.
+    """
+
+    def __init__(self, keys: List[str], vectors, precision: str = "float32"):
+        if precision not in PRECISIONS:
+            raise ValueError(f"Unknown precision: {precision} (expected one of {', '.join(PRECISIONS)})")
+
+        self.keys = list(keys)
+        self.precision = precision
+        self.scales: Optional[np.ndarray] = None
+
+        work_dtype = np.float64 if precision == "float64" else np.float32
+        matrix = np.array(vectors, dtype=work_dtype)
+        if matrix.ndim != 2:
+            matrix = matrix.reshape(len(self.keys), -1 if self.keys else 0)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        matrix /= norms
+
+        if precision == "int8":
+            scales = np.abs(matrix).max(axis=1, initial=0.0) / 127.0
+            scales[scales == 0] = 1.0
+            self.matrix = np.round(matrix / scales[:, None]).astype(np.int8)
+            self.scales = scales.astype(np.float32)
+        else:
+            self.matrix = matrix.astype(precision, copy=False)
+
+    @classmethod
+    def from_arrays(cls,
+                    keys: List[str],
+                    matrix: np.ndarray,
+                    precision: str,
+                    scales: Optional[np.ndarray] = None) -> "EmbeddingMatrix":
+        """Wrap already-normalised arrays (e.g. memory-mapped) without copying"""
+        self = cls.__new__(cls)
+        self.keys = list(keys)
+        self.precision = precision
+        self.matrix = matrix
+        self.scales = scales
+        return self
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.keys
+
+    @property
+    def dim(self) -> int:
+        return self.matrix.shape[1] if self.matrix.ndim == 2 else 0
+
+    @property
+    def nbytes(self) -> int:
+        return self.matrix.nbytes + (self.scales.nbytes if self.scales is not None else 0)
+
+    def scores(self, query: np.ndarray) -> np.ndarray:
+        """Cosine similarity of ``query`` against every row"""
+        return self.scores_batch(np.asarray(query)[None, :])[0]
+
+    def scores_batch(self, queries: np.ndarray) -> np.ndarray:
+        """Cosine similarities as a (num_queries, rows) matrix-matrix product.
+
+        float16 and int8 rows are cast to float32 in blocks of
+        ``SCORE_BLOCK_ROWS``, so scoring never holds more than one block's
+        float32 copy however large (or memory-mapped) the index is.
+        """
+        queries = np.asarray(queries, dtype=np.float64 if self.precision == "float64" else np.float32)
+        if not self.keys:
+            return np.zeros((len(queries), 0), dtype=queries.dtype)
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        queries = queries / norms
+
+        if self.matrix.dtype == queries.dtype:
+            scores = queries @ self.matrix.T
+        else:
+            scores = np.empty((len(queries), len(self.keys)), dtype=np.float32)
+            buffer = np.empty((min(SCORE_BLOCK_ROWS, len(self.keys)), self.dim), dtype=np.float32)
+            for start in range(0, len(self.keys), SCORE_BLOCK_ROWS):
+                rows = self.matrix[start:start + SCORE_BLOCK_ROWS]
+                block = buffer[:len(rows)]
+                np.copyto(block, rows, casting="unsafe")
+                np.matmul(queries, block.T, out=scores[:, start:start + len(rows)])
+        if self.scales is not None:
+            scores *= self.scales
+        return scores
+
+    def describe(self) -> Dict[str, object]:
+        return {
+            "rows": len(self.keys),
+            "dim": self.dim,
+            "precision": self.precision,
+            "bytes": self.nbytes
+        }
+
+def measure_recall(reference, quantized: EmbeddingMatrix, queries, k: int = 10) -> Dict[str, float]:
+    """Top-k recall of ``quantized`` against exact float64 cosine scores.
+
+    ``reference`` holds the original vectors for the same keys, in order.
+    """
+    exact = EmbeddingMatrix(quantized.keys, reference, "float64")
+
+    k = min(k, len(exact))
+    if not k:
+        return {"k": 0, "recall": 1.0, "recall_delta": 0.0, "max_score_error": 0.0}
+
+    hits = 0
+    total = 0
+    max_error = 0.0
+    for query in queries:
+        expected = exact.scores(np.asarray(query, dtype=np.float64))
+        actual = quantized.scores(query)
+        top_expected = set(np.argpartition(-expected, k - 1)[:k].tolist())
+        top_actual = set(np.argpartition(-actual, k - 1)[:k].tolist())
+        hits += len(top_expected & top_actual)
+        total += k
+        max_error = max(max_error, float(np.max(np.abs(expected - actual))))
+
+    recall = hits / total if total else 1.0
+    return {"k": k, "recall": recall, "recall_delta": recall - 1.0, "max_score_error": max_error}
@@ -0,0 +1,98 @@
+"""Cheap keyword/capability matching over the registry.
+
+Used while the embedding index is unavailable. Pure Python with no heavy
+imports, so it is ready as soon as the registry JSON is parsed.
+"""
+
+import re
+from collections import defaultdict
+from typing import Dict, List, Any, Set, Tuple
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+STOPWORDS = {
+    "a", "an", "the", "to", "for", "of", "in", "on", "my", "me", "i", "is", "it",
+    "and", "or", "with", "this", "that", "please", "need", "want", "can", "you",
+    "how", "do", "some", "from", "be", "all"
+}
+
+def tokenize(text: str) -> Set[str]:
+    """Lowercase word tokens with stopwords and plural 's' removed"""
+    tokens = set()
+    for token in TOKEN_RE.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.add(token)
+    return tokens
+
+class LexicalIndex:
+    """Inverted index from registry tokens to MCPs and tools"""
+
+    def __init__(self, registry: Dict[str, Any]):
+        self.registry = registry
+        # (mcp_name, tool_name) entries; tool_name "*" is the MCP itself
+        self.entries: List[Tuple[str, str]] = []
+        self.postings: Dict[str, List[int]] = defaultdict(list)
+
+        for mcp_name, mcp_config in registry.get("mcps", {}).items():
+            self._add(mcp_name, "*", [
+                mcp_name,
+                mcp_config.get("description", ""),
+                " ".join(mcp_config.get("capabilities", [])),
+                " ".join(mcp_config.get("keywords", []))
+            ])
+
+            for tool_name, tool_config in mcp_config.get("tools", {}).items():
+                self._add(mcp_name, tool_name, [
+                    tool_name.replace("_", " "),
+                    tool_config.get("description", ""),
+                    " ".join(tool_config.get("examples", [])),
+                    " ".join(tool_config.get("keywords", []))
+                ])
+
+    def _add(self, mcp_name: str, tool_name: str, text_parts: List[str]):
+        entry_id = len(self.entries)
+        self.entries.append((mcp_name, tool_name))
+        for token in tokenize(" ".join(filter(None, text_parts))):
+            self.postings[token].append(entry_id)
+
+    def find_tools(self, query: str, threshold: float = 0.5) -> List[Dict[str, Any]]:
+        """Score entries by the fraction of query tokens they contain"""
+        query_tokens = tokenize(query)
+        if not query_tokens:
+            return []
+
+        hits: Dict[int, int] = defaultdict(int)
+        for token in query_tokens:
+            for entry_id in self.postings.get(token, ()):
+                hits[entry_id] += 1
+
+        matches = []
+        for entry_id, count in hits.items():
+            score = count / len(query_tokens)
+            if score < threshold:
+                continue
+
+            mcp_name, tool_name = self.entries[entry_id]
+            mcp_config = self.registry["mcps"][mcp_name]
+            if tool_name == "*":
+                description = mcp_config.get("description", "")
+                capabilities = mcp_config.get("capabilities", [])
+            else:
+                description = mcp_config["tools"][tool_name].get("description", "")
+                capabilities = []
+
+            matches.append({
+                "mcp": mcp_name,
+                "tool": tool_name,
+                "confidence": score,
+                "description": description,
+                "capabilities": capabilities,
+                "degraded": True
+            })
+
+        # Prefer specific tools over whole MCPs on equal scores
+        matches.sort(key=lambda x: (x["confidence"], x["tool"] != "*"), reverse=True)
+        return matches
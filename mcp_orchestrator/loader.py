@@ -0,0 +1,176 @@
+"""Background construction of the orchestrator for fast server startup"""
+
+import time
+import asyncio
+import logging
+import threading
+from typing import Dict, List, Any, Optional
+
+from .lexical import LexicalIndex
+from .metrics import metrics
+from .registry import load_registry, list_capabilities
+
+logger = logging.getLogger(__name__)
+
+class BackgroundOrchestrator:
+    """Builds MCPOrchestrator off the event loop.
+
+    numpy, requests and the embedding precompute are only touched by the
+    build thread, so the server can answer ``initialize`` and ``list_tools``
+    straight away. The same thread first parses the registry and builds
+    the keyword index, so the loop never does either. Routing calls wait up
+    to ``index_wait`` seconds for the index and otherwise answer from that
+    lexical match. Extra keyword arguments are passed to MCPOrchestrator.
+    """
+
+    def __init__(self,
+                 registry_path: str = "config/registry.json",
+                 lm_studio_url: str = "http://127.0.0.1:1234",
+                 index_wait: float = 2.0,
+                 **options: Any):
+        self.registry_path = registry_path
+        self.lm_studio_url = lm_studio_url
+        self.options = options
+        self.index_wait = index_wait
+        self.orchestrator = None
+        self.error: Optional[BaseException] = None
+        self._registry: Optional[Dict[str, Any]] = None
+        self._lexical: Optional[LexicalIndex] = None
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ready: Optional[asyncio.Event] = None
+        self._registry_ready: Optional[asyncio.Event] = None
+
+    @property
+    def ready(self) -> bool:
+        """True once the build has finished, successfully or not"""
+        return self._ready is not None and self._ready.is_set()
+
+    @property
+    def registry(self) -> Optional[Dict[str, Any]]:
+        """The registry, or None while the build thread is still parsing it"""
+        if self.orchestrator is not None:
+            return self.orchestrator.registry
+        return self._registry
+
+    async def wait_registry(self) -> Dict[str, Any]:
+        """The registry once parsed; raises the build error if it could not be read"""
+        await self._wait_registry(None)
+        if self.registry is None:
+            raise self.error
+        return self.registry
+
+    async def _wait_registry(self, timeout: Optional[float]):
+        if self._registry_ready is None:
+            self.start()
+        if not self._registry_ready.is_set():
+            try:
+                await asyncio.wait_for(self._registry_ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self):
+        """Start building the index; must be called from the event loop"""
+        if self._thread is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._ready = asyncio.Event()
+        self._registry_ready = asyncio.Event()
+        self._thread = threading.Thread(
+            target=self._build, name="orchestrator-index", daemon=True
+        )
+        self._thread.start()
+
+    def _build(self):
+        try:
+            # Fallback routing needs only these; publish them before the slow part
+            registry = load_registry(self.registry_path)
+            self._lexical = LexicalIndex(registry)
+            self._registry = registry
+            self._loop.call_soon_threadsafe(self._registry_ready.set)
+            
+            with metrics.timer("index_ready"):
+                from .orchestrator import MCPOrchestrator
+                orchestrator = MCPOrchestrator(
+                    self.registry_path, self.lm_studio_url, **self.options
+                )
+            self.orchestrator = orchestrator
+            logger.info("Routing index ready")
+        except Exception as e:
+            self.error = e
+            logger.error(f"Index build failed, staying on lexical routing: {str(e)}")
+        finally:
+            self._loop.call_soon_threadsafe(self._registry_ready.set)
+            self._loop.call_soon_threadsafe(self._ready.set)
+
+    async def wait_ready(self, timeout: Optional[float] = None):
+        """Wait up to ``timeout`` seconds for the orchestrator; None if not ready"""
+        if self._ready is None:
+            self.start()
+        if not self._ready.is_set() and timeout:
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self.orchestrator
+
+    async def find_tools(self,
+                         query: str,
+                         threshold: float = 0.5,
+                         budget: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Route with the embedding index, or lexically until it is ready.
+
+        ``budget`` bounds the whole call in seconds, including the wait for
+        the index; see MCPOrchestrator.find_tools.
+        """
+        deadline = time.monotonic() + budget if budget is not None else None
+        orchestrator = await self.wait_ready(self._index_wait(budget))
+        if orchestrator is not None:
+            return await orchestrator.find_tools(query, threshold, self._remaining(deadline))
+
+        lexical = await self._keyword_index(deadline)
+        if lexical is None:
+            return []
+        metrics.incr("lexical_fallbacks")
+        return lexical.find_tools(query, threshold)
+
+    async def find_tools_batch(self,
+                               queries: List[str],
+                               threshold: float = 0.5,
+                               top_k: Optional[int] = 5,
+                               budget: Optional[float] = None) -> List[List[Dict[str, Any]]]:
+        """Batch routing, with the same lexical fallback as find_tools"""
+        deadline = time.monotonic() + budget if budget is not None else None
+        orchestrator = await self.wait_ready(self._index_wait(budget))
+        if orchestrator is not None:
+            return await orchestrator.find_tools_batch(queries, threshold, top_k, self._remaining(deadline))
+
+        lexical = await self._keyword_index(deadline)
+        if lexical is None:
+            return [[] for _ in queries]
+        metrics.incr("lexical_fallbacks", len(queries))
+        results = []
+        for query in queries:
+            matches = lexical.find_tools(query, threshold)
+            results.append(matches[:top_k] if top_k else matches)
+        return results
+
+    async def _keyword_index(self, deadline: Optional[float]) -> Optional[LexicalIndex]:
+        """The keyword index from the build thread; None if not ready by ``deadline``"""
+        await self._wait_registry(self._remaining(deadline))
+        if self._lexical is None:
+            if self.error is not None:
+                raise self.error
+            metrics.incr("lexical_unavailable")
+        return self._lexical
+
+    def _index_wait(self, budget: Optional[float]) -> float:
+        return self.index_wait if budget is None else min(self.index_wait, budget)
+
+    @staticmethod
+    def _remaining(deadline: Optional[float]) -> Optional[float]:
+        return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+    async def list_all_capabilities(self, category: Optional[str] = None) -> Dict[str, List[str]]:
+        """List all available capabilities, optionally filtered"""
+        return list_capabilities(await self.wait_registry(), category)
@@ -0,0 +1,180 @@
+"""Low-overhead latency histograms and counters for the orchestrator"""
+
+import os
+import time
+import logging
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) shared by every stage histogram. Fixed buckets keep
+# observe() to a bisect and an increment, so metrics can stay on in production.
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+
+class Histogram:
+    """Fixed-bucket histogram of durations in seconds"""
+
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        # One slot per bucket plus the +Inf overflow slot
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile as the upper bound of the bucket containing it"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return self.buckets[i] if i < len(self.buckets) else float("inf")
+        return float("inf")
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+            "buckets": {
+                ("+Inf" if i == len(self.buckets) else str(self.buckets[i])): c
+                for i, c in enumerate(self.counts)
+            }
+        }
+
+class _Timer:
+    """Context manager recording elapsed monotonic time into a stage"""
+
+    __slots__ = ("metrics", "stage", "start")
+
+    def __init__(self, metrics: "Metrics", stage: str):
+        self.metrics = metrics
+        self.stage = stage
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.metrics.observe(self.stage, time.perf_counter() - self.start)
+        return False
+
+class _NullTimer:
+    """Shared no-op timer handed out while metrics are disabled"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NULL_TIMER = _NullTimer()
+
+class Metrics:
+    """Per-stage latency histograms plus named counters"""
+
+    def __init__(self, enabled: bool = True, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.enabled = enabled
+        self.buckets = buckets
+        self.histograms: Dict[str, Histogram] = {}
+        self.counters: Dict[str, int] = {}
+        self.started = time.monotonic()
+
+    def timer(self, stage: str):
+        """Time a block: ``with metrics.timer("embedding_http"): ...``"""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, stage)
+
+    def observe(self, stage: str, seconds: float):
+        """Record a duration for a stage"""
+        if not self.enabled:
+            return
+        histogram = self.histograms.get(stage)
+        if histogram is None:
+            histogram = self.histograms[stage] = Histogram(self.buckets)
+        histogram.observe(seconds)
+
+    def incr(self, name: str, value: int = 1):
+        """Increment a named counter"""
+        if not self.enabled:
+            return
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def reset(self):
+        """Drop all recorded data"""
+        self.histograms.clear()
+        self.counters.clear()
+        self.started = time.monotonic()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-serialisable view of all stages and counters"""
+        return {
+            "enabled": self.enabled,
+            "uptime_seconds": time.monotonic() - self.started,
+            "stages": {
+                stage: histogram.snapshot()
+                for stage, histogram in sorted(list(self.histograms.items()))
+            },
+            "counters": dict(sorted(list(self.counters.items())))
+        }
+
+    def to_prometheus(self, prefix: str = "mcp_orchestrator") -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        lines = [
+            f"# HELP {prefix}_stage_seconds Latency of orchestrator stages",
+            f"# TYPE {prefix}_stage_seconds histogram"
+        ]
+        # list() copies in one step: embedding worker threads may add stages
+        for stage, histogram in sorted(list(self.histograms.items())):
+            cumulative = 0
+            for i, bucket_count in enumerate(histogram.counts):
+                cumulative += bucket_count
+                le = "+Inf" if i == len(histogram.buckets) else repr(histogram.buckets[i])
+                lines.append(f'{prefix}_stage_seconds_bucket{{stage="{stage}",le="{le}"}} {cumulative}')
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{stage}"}} {histogram.sum}')
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{stage}"}} {histogram.count}')
+
+        for name, value in sorted(list(self.counters.items())):
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            lines.append(f"{prefix}_{name}_total {value}")
+
+        return "\n".join(lines) + "\n"
+
+    def dump_prometheus(self, path: str):
+        """Atomically write the Prometheus text format to a file"""
+        target = Path(path)
+        tmp = target.with_name(target.name + ".tmp")
+        tmp.write_text(self.to_prometheus())
+        os.replace(tmp, target)
+
+def _env_flag(name: str, default: bool) -> bool:
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() not in ("0", "false", "no", "off", "")
+
+# Global metrics registry. Disable with MCP_ORCHESTRATOR_METRICS=0.
+metrics = Metrics(enabled=_env_flag("MCP_ORCHESTRATOR_METRICS", True))
+
+# Optional Prometheus text-format dump, refreshed by the server
+METRICS_FILE: Optional[str] = os.environ.get("MCP_ORCHESTRATOR_METRICS_FILE") or None
+METRICS_DUMP_INTERVAL = float(os.environ.get("MCP_ORCHESTRATOR_METRICS_INTERVAL", "15"))
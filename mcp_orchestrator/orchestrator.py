@@ -1,13 +1,23 @@
 """Core orchestrator logic with embedding-based routing"""
 
-import json
+import time
+import asyncio
 import numpy as np
 import requests
 import logging
-from pathlib import Path
 from typing import Dict, List, Tuple, Optional, Any
 from dataclasses import dataclass
 
+from .circuit_breaker import CircuitBreaker
+from .embedding_cache import EmbeddingCache
+from .index import EmbeddingMatrix
+from .lexical import LexicalIndex
+from .metrics import metrics
+from .registry import load_registry, list_capabilities
+from .semantic_cache import HashingEmbedder, SemanticCache
+from .shared_index import SharedIndexStore, index_fingerprint, index_scope
+from .tracing import tracer, current_span
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -24,54 +34,367 @@ class MCPOrchestrator:
     
     def __init__(self, 
                  registry_path: str = "config/registry.json",
-                 lm_studio_url: str = "http://127.0.0.1:1234"):
+                 lm_studio_url: str = "http://127.0.0.1:1234",
+                 precision: str = "float32",
+                 embed_batch_size: int = 64,
+                 shared_index: Optional[str] = None,
+                 refresh_interval: float = 5.0,
+                 embedding_cache_size: int = 4096,
+                 semantic_cache_size: int = 512,
+                 semantic_cache_distance: float = 0.05,
+                 semantic_cache_embedder: str = "remote",
+                 embedding_timeout: float = 5.0,
+                 breaker_threshold: int = 3,
+                 breaker_reset: float = 10.0,
+                 max_embedding_requests: int = 4):
         self.lm_studio_url = lm_studio_url
         self.embedding_model = "text-embedding-granite-embedding-278m-multilingual"
-        self.embedding_cache = {}
+        # Texts sent per /v1/embeddings request when building the index
+        self.embed_batch_size = embed_batch_size
+        # Storage precision of the routing index: float32, float16 or int8
+        self.precision = precision
+        # Exact-text query embeddings, least recently used evicted first
+        self.embedding_cache = EmbeddingCache(embedding_cache_size)
+        self._embedding_failures = 0
         
-        # Load registry
-        registry_file = Path(registry_path)
-        if not registry_file.exists():
-            # Use default registry
-            registry_file = Path(__file__).parent.parent / "config" / "registry.json"
+        # Skip the embedding endpoint entirely while it keeps failing
+        self.embedding_timeout = embedding_timeout
+        self.embedding_breaker = CircuitBreaker(breaker_threshold, breaker_reset)
+        # Query embedding requests in flight, by text, and a cap on how many run at once
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.max_embedding_requests = max_embedding_requests
+        self._embedding_slots = asyncio.Semaphore(max_embedding_requests)
+        self._embedding_requests = 0
         
-        with open(registry_file, 'r') as f:
-            self.registry = json.load(f)
+        # Reuse routing results for rephrasings of recent queries. Probing with
+        # the "local" embedder lets a hit skip the remote embedding call too.
+        self.semantic_cache = (
+            SemanticCache(semantic_cache_size, semantic_cache_distance)
+            if semantic_cache_size > 0 else None
+        )
+        self.local_embedder = HashingEmbedder() if semantic_cache_embedder == "local" else None
         
-        # Pre-compute embeddings
-        logger.info("Pre-computing MCP embeddings...")
-        self.mcp_embeddings = self._compute_mcp_embeddings()
-        self.tool_embeddings = self._compute_tool_embeddings()
+        # Optional host-wide index shared through memory-mapped files, followed
+        # only by processes with the same registry file, model and precision
+        self.shared_store = (
+            SharedIndexStore(shared_index, scope=index_scope(registry_path, self.embedding_model, precision))
+            if shared_index else None
+        )
+        self.generation: Optional[str] = None
+        self.refresh_interval = refresh_interval
+        self._next_refresh = 0.0
+        self._refreshing: Optional[asyncio.Task] = None
+        self._rebuilding: Optional[asyncio.Task] = None
+        self._next_rebuild = 0.0
+        
+        # Load registry
+        self.registry = load_registry(registry_path)
+        # Keyword index answering queries whose embedding is late or unavailable.
+        # Built with the registry, never by a routing call on the event loop.
+        self.lexical = LexicalIndex(self.registry)
+        
+        with metrics.timer("index_build"):
+            if self.shared_store is not None:
+                self._attach_or_publish()
+            else:
+                self._build_index()
         logger.info(f"Computed embeddings for {len(self.mcp_embeddings)} MCPs")
     
+    def _build_index(self):
+        """Pre-compute embeddings for every MCP and tool"""
+        self._set_index(*self._compute_index())
+    
+    def _compute_index(self) -> Tuple[EmbeddingMatrix, EmbeddingMatrix, bool]:
+        """Embed the registry; the flag is False if any vectors are random fallbacks"""
+        logger.info("Pre-computing MCP embeddings...")
+        self._embedding_failures = 0
+        mcp_embeddings = self._compute_mcp_embeddings()
+        tool_embeddings = self._compute_tool_embeddings()
+        return mcp_embeddings, tool_embeddings, not self._embedding_failures
+    
+    def _set_index(self, mcp_embeddings: EmbeddingMatrix, tool_embeddings: EmbeddingMatrix, complete: bool):
+        self.mcp_embeddings = mcp_embeddings
+        self.tool_embeddings = tool_embeddings
+        # An index padded with random vectors scores noise; route lexically until rebuilt
+        self.index_complete = complete
+        self._invalidate_results()
+    
+    def _attach_or_publish(self):
+        """Attach to the shared index for this registry, building it if missing"""
+        generation = index_fingerprint(self.registry, self.embedding_model, self.precision)
+        incomplete = self._publish_generation(generation)
+        if incomplete is not None:
+            self._set_index(*incomplete, complete=False)
+            return
+        
+        # Use the mapped copy even after publishing, so the private one is freed
+        self._attach(generation)
+    
+    def _publish_generation(self, generation: str) -> Optional[Tuple[EmbeddingMatrix, EmbeddingMatrix]]:
+        """Build and publish ``generation`` unless it exists.
+        
+        Returns None when the generation is available, or the private
+        matrices if the embedding service failed during the build.
+        """
+        with self.shared_store.build_lock(generation):
+            if not self.shared_store.exists(generation):
+                mcp_embeddings, tool_embeddings, complete = self._compute_index()
+                if not complete:
+                    # Never share an index padded with random fallback vectors
+                    logger.warning("Embedding service unavailable, not publishing shared index")
+                    return mcp_embeddings, tool_embeddings
+                self.shared_store.publish(generation, self.registry, mcp_embeddings, tool_embeddings)
+        return None
+    
+    def _schedule_rebuild(self):
+        """Rebuild an incomplete index in the background once embeddings work again"""
+        now = time.monotonic()
+        if self._rebuilding is not None and not self._rebuilding.done():
+            return
+        if now < self._next_rebuild or self.embedding_breaker.state == "open":
+            return
+        self._next_rebuild = now + self.embedding_breaker.reset_timeout
+        self._rebuilding = asyncio.create_task(self._rebuild_index())
+    
+    async def _rebuild_index(self):
+        metrics.incr("index_rebuilds")
+        if self.shared_store is None:
+            mcp_embeddings, tool_embeddings, complete = await asyncio.to_thread(self._compute_index)
+            if not complete:
+                return
+            self._set_index(mcp_embeddings, tool_embeddings, True)
+        else:
+            generation = index_fingerprint(self.registry, self.embedding_model, self.precision)
+            if await asyncio.to_thread(self._publish_generation, generation) is not None:
+                return
+            self._adopt(generation, *await asyncio.to_thread(self._load_generation, generation))
+        logger.info("Rebuilt routing index after the embedding service recovered")
+    
+    def _attach(self, generation: str):
+        self._adopt(generation, *self._load_generation(generation))
+    
+    def _load_generation(self, generation: str) -> Tuple[Dict[str, Any], EmbeddingMatrix, EmbeddingMatrix, LexicalIndex]:
+        """Map a generation and build its keyword index; blocking, run off the loop"""
+        registry, mcp_embeddings, tool_embeddings = self.shared_store.attach(generation)
+        return registry, mcp_embeddings, tool_embeddings, LexicalIndex(registry)
+    
+    def _adopt(self, 
+               generation: str, 
+               registry: Dict[str, Any], 
+               mcp_embeddings: EmbeddingMatrix, 
+               tool_embeddings: EmbeddingMatrix,
+               lexical: LexicalIndex):
+        """Switch to an attached generation in one step"""
+        self.registry = registry
+        self.lexical = lexical
+        self.generation = generation
+        # Only complete indexes are ever published
+        self._set_index(mcp_embeddings, tool_embeddings, True)
+        metrics.incr("shared_index_attaches")
+        logger.info(f"Attached shared routing index generation {generation}")
+    
+    def _invalidate_results(self):
+        """Forget cached routing results after the index or registry changed"""
+        if self.semantic_cache is not None:
+            self.semantic_cache.clear()
+    
+    def refresh_shared_index(self):
+        """Check for a newer generation published by another process.
+        
+        Reading the pointer and parsing the generation's metadata happen in
+        a worker thread; routing keeps using the current index meanwhile.
+        Must be called from the event loop.
+        """
+        if self.shared_store is None:
+            return
+        
+        now = time.monotonic()
+        if now < self._next_refresh or (self._refreshing and not self._refreshing.done()):
+            return
+        self._next_refresh = now + self.refresh_interval
+        self._refreshing = asyncio.create_task(self._refresh_shared_index())
+    
+    async def _refresh_shared_index(self):
+        current = await asyncio.to_thread(self.shared_store.current)
+        if not current or current == self.generation:
+            return
+        try:
+            attached = await asyncio.to_thread(self._load_generation, current)
+        except (OSError, ValueError, KeyError) as e:
+            logger.error(f"Could not attach index generation {current}: {str(e)}")
+            return
+        self._adopt(current, *attached)
+    
     def get_embedding(self, text: str) -> np.ndarray:
         """Get embedding from Granite via LM Studio with caching"""
-        if text in self.embedding_cache:
-            return self.embedding_cache[text]
+        return self.get_embeddings([text])[0]
+    
+    def get_embeddings(self, texts: List[str], fallback: bool = True,
+                       slow_after: Optional[float] = None) -> Optional[np.ndarray]:
+        """Embed several texts, fetching all uncached ones in a single request.
         
-        try:
-            response = requests.post(
-                f"{self.lm_studio_url}/v1/embeddings",
-                json={
-                    "model": self.embedding_model,
-                    "input": text
-                },
-                timeout=5.0
-            )
-            response.raise_for_status()
+        If the request fails, uncached texts get random vectors, or with
+        ``fallback=False`` the result is None. A request slower than
+        ``slow_after`` seconds counts as a failure for the circuit breaker.
+        """
+        vectors: List[Optional[np.ndarray]] = [None] * len(texts)
+        missing: Dict[str, List[int]] = {}
+        
+        for i, text in enumerate(texts):
+            cached = self.embedding_cache.get(text)
+            if cached is not None:
+                metrics.incr("embedding_cache_hits")
+                vectors[i] = cached
+            else:
+                missing.setdefault(text, []).append(i)
+        
+        if missing:
+            metrics.incr("embedding_cache_misses", len(missing))
+            fetched = self._request_embeddings(list(missing), slow_after)
+            if fetched is None and not fallback:
+                return None
+            
+            for j, (text, positions) in enumerate(missing.items()):
+                if fetched is None:
+                    # Fallback to random embedding if service unavailable
+                    embedding = self._random_embedding()
+                else:
+                    embedding = fetched[j]
+                    self.embedding_cache.put(text, embedding)
+                for i in positions:
+                    vectors[i] = embedding
+        
+        return np.vstack(vectors)
+    
+    async def embed_queries(self, texts: List[str], budget: Optional[float] = None) -> Optional[np.ndarray]:
+        """Query embeddings without blocking the event loop on a remote call.
+        
+        None if the endpoint failed, its circuit breaker is open, all request
+        slots are busy, or the embeddings did not arrive within ``budget``
+        seconds. Texts already being fetched join that request instead of
+        sending another. A late request keeps running and fills the cache
+        for the next call.
+        """
+        # Hold on to the vectors: the cache may evict them while we await
+        known: Dict[str, np.ndarray] = {}
+        uncached = []
+        for text in dict.fromkeys(texts):
+            vector = self.embedding_cache.get(text)
+            if vector is None:
+                uncached.append(text)
+            else:
+                known[text] = vector
+        hits = sum(text in known for text in texts)
+        if hits:
+            metrics.incr("embedding_cache_hits", hits)
+        
+        with tracer.span("embedding", texts=len(texts), uncached=len(uncached)) as span:
+            if not uncached:
+                return np.vstack([known[text] for text in texts])
+            if self.embedding_breaker.state == "open":
+                metrics.incr("embedding_breaker_skips")
+                span.set(error="circuit open")
+                return None
             
-            embedding = np.array(response.json()["data"][0]["embedding"])
-            self.embedding_cache[text] = embedding
-            return embedding
+            new = [text for text in uncached if text not in self._inflight]
+            if new:
+                if budget is not None and self._embedding_requests >= self.max_embedding_requests:
+                    # Queueing behind busy requests would only run past the budget
+                    metrics.incr("embedding_requests_shed")
+                    span.set(error="no request slot")
+                    return None
+                self._embedding_requests += 1
+                fetch = asyncio.ensure_future(self._fetch_embeddings(new, budget))
+                for text in new:
+                    self._inflight[text] = fetch
+            if len(new) < len(uncached):
+                metrics.incr("embedding_requests_joined", len(uncached) - len(new))
             
+            fetches = {self._inflight[text] for text in uncached}
+            _, late = await asyncio.wait(
+                fetches, timeout=None if budget is None else max(budget, 0.0)
+            )
+            if late:
+                metrics.incr("embedding_budget_exceeded")
+                span.set(error="budget exceeded")
+                return None
+            for fetch in fetches:
+                fetched = fetch.result()
+                if fetched is None:
+                    return None
+                known.update(fetched)
+            return np.vstack([known[text] for text in texts])
+    
+    async def _fetch_embeddings(self, texts: List[str], slow_after: Optional[float]) -> Optional[Dict[str, np.ndarray]]:
+        """Embed ``texts`` in a worker thread, holding one request slot"""
+        try:
+            async with self._embedding_slots:
+                embeddings = await asyncio.to_thread(self.get_embeddings, texts, False, slow_after)
+            return None if embeddings is None else dict(zip(texts, embeddings))
+        finally:
+            self._embedding_requests -= 1
+            for text in texts:
+                self._inflight.pop(text, None)
+    
+    def _random_embedding(self) -> np.ndarray:
+        return np.random.randn(768).astype(np.float32)
+    
+    def _request_embeddings(self, texts: List[str], slow_after: Optional[float] = None) -> Optional[np.ndarray]:
+        """Fetch float32 embeddings for ``texts`` from LM Studio, None on failure"""
+        if not self.embedding_breaker.allow():
+            metrics.incr("embedding_breaker_skips")
+            return None
+        started = time.monotonic()
+        try:
+            with metrics.timer("embedding_http"):
+                response = requests.post(
+                    f"{self.lm_studio_url}/v1/embeddings",
+                    json={
+                        "model": self.embedding_model,
+                        "input": texts[0] if len(texts) == 1 else texts
+                    },
+                    timeout=self.embedding_timeout
+                )
+                response.raise_for_status()
+                
+                data = sorted(response.json()["data"], key=lambda d: d.get("index", 0))
+                embeddings = np.array([d["embedding"] for d in data], dtype=np.float32)
+            if slow_after is not None and time.monotonic() - started > slow_after:
+                # Useful for the cache, but too slow to route with: keep callers off it
+                metrics.incr("embedding_slow")
+                self.embedding_breaker.record_failure()
+            else:
+                self.embedding_breaker.record_success()
+            return embeddings
+            
+        except requests.Timeout as e:
+            metrics.incr("embedding_timeouts")
+            current_span().set(error="timeout")
+            logger.error(f"Embedding timeout: {str(e)}")
         except Exception as e:
+            metrics.incr("embedding_errors")
+            current_span().set(error=str(e))
             logger.error(f"Embedding error: {str(e)}")
-            # Fallback to random embedding if service unavailable
-            return np.random.randn(768)
+        self.embedding_breaker.record_failure()
+        return None
     
-    def _compute_mcp_embeddings(self) -> Dict[str, np.ndarray]:
-        """Pre-compute embeddings for all MCP capabilities"""
-        embeddings = {}
+    def _index_embeddings(self, texts: List[str]) -> List[np.ndarray]:
+        """Embed registry text for the index without filling the query cache"""
+        vectors = []
+        for start in range(0, len(texts), self.embed_batch_size):
+            batch = texts[start:start + self.embed_batch_size]
+            embeddings = self._request_embeddings(batch)
+            if embeddings is None:
+                self._embedding_failures += 1
+                # Fallback to random embedding if service unavailable
+                vectors.extend(self._random_embedding() for _ in batch)
+            else:
+                vectors.extend(embeddings)
+        return vectors
+    
+    def mcp_texts(self) -> List[Tuple[str, str]]:
+        """(mcp_name, text) pairs embedded for MCP-level matching"""
+        texts = []
         
         for mcp_name, mcp_config in self.registry.get("mcps", {}).items():
             # Combine all descriptive text
@@ -83,13 +406,13 @@ class MCPOrchestrator:
             combined_text = " ".join(filter(None, text_parts))
             
             if combined_text:
-                embeddings[mcp_name] = self.get_embedding(combined_text)
+                texts.append((mcp_name, combined_text))
         
-        return embeddings
+        return texts
     
-    def _compute_tool_embeddings(self) -> Dict[str, np.ndarray]:
-        """Pre-compute embeddings for individual tools"""
-        embeddings = {}
+    def tool_texts(self) -> List[Tuple[str, str]]:
+        """("mcp::tool", text) pairs embedded for tool-level matching"""
+        texts = []
         
         for mcp_name, mcp_config in self.registry.get("mcps", {}).items():
             tools = mcp_config.get("tools", {})
@@ -107,48 +430,173 @@ class MCPOrchestrator:
                 combined_text = " ".join(filter(None, text_parts))
                 
                 if combined_text:
-                    embeddings[tool_key] = self.get_embedding(combined_text)
+                    texts.append((tool_key, combined_text))
         
-        return embeddings
+        return texts
+    
+    def _build_matrix(self, texts: List[Tuple[str, str]]) -> EmbeddingMatrix:
+        keys = [key for key, _ in texts]
+        vectors = self._index_embeddings([text for _, text in texts])
+        return EmbeddingMatrix(keys, vectors, self.precision)
+    
+    def _compute_mcp_embeddings(self) -> EmbeddingMatrix:
+        """Pre-compute embeddings for all MCP capabilities"""
+        return self._build_matrix(self.mcp_texts())
+    
+    def _compute_tool_embeddings(self) -> EmbeddingMatrix:
+        """Pre-compute embeddings for individual tools"""
+        return self._build_matrix(self.tool_texts())
+    
+    def describe_index(self) -> Dict[str, Any]:
+        """Size and precision of the routing index and query cache"""
+        return {
+            "generation": self.generation,
+            "shared": self.generation is not None,
+            "complete": self.index_complete,
+            "mcps": self.mcp_embeddings.describe(),
+            "tools": self.tool_embeddings.describe(),
+            "embedding_cache": self.embedding_cache.stats(),
+            "semantic_cache": self.semantic_cache.stats() if self.semantic_cache else None,
+            "embedding_endpoint": self.embedding_breaker.describe()
+        }
     
     def cosine_similarity(self, a: np.ndarray, b: np.ndarray) -> float:
         """Calculate cosine similarity between two vectors"""
         return float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b)))
     
-    async def find_tools(self, query: str, threshold: float = 0.5) -> List[Dict[str, Any]]:
-        """Find matching tools for a query"""
-        query_embedding = self.get_embedding(query)
+    async def find_tools(self, 
+                         query: str, 
+                         threshold: float = 0.5,
+                         budget: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Find matching tools for a query.
+        
+        With a ``budget`` in seconds, a query embedding that is not back in
+        time is replaced by a keyword match, marked ``degraded``.
+        """
+        return (await self._route([query], threshold, None, "similarity", budget))[0]
+    
+    async def find_tools_batch(self, 
+                               queries: List[str], 
+                               threshold: float = 0.5,
+                               top_k: Optional[int] = 5,
+                               budget: Optional[float] = None) -> List[List[Dict[str, Any]]]:
+        """Find matching tools for many queries with one embedding round-trip"""
+        if not queries:
+            return []
+        return await self._route(queries, threshold, top_k, "similarity_batch", budget)
+    
+    async def _route(self, 
+                     queries: List[str], 
+                     threshold: float, 
+                     top_k: Optional[int],
+                     stage: str,
+                     budget: Optional[float] = None) -> List[List[Dict[str, Any]]]:
+        """Route queries through the semantic cache, embedding and scoring"""
+        with tracer.span("route", queries=len(queries), threshold=threshold, budget=budget) as span:
+            deadline = time.monotonic() + budget if budget is not None else None
+            results = await self._route_queries(queries, threshold, stage, span, deadline)
+        return [result[:top_k] if top_k else list(result) for result in results]
+    
+    async def _route_queries(self,
+                             queries: List[str],
+                             threshold: float,
+                             stage: str,
+                             span,
+                             deadline: Optional[float]) -> List[List[Dict[str, Any]]]:
+        """Full match lists per query; ``span`` records cache hits and decisions"""
+        self.refresh_shared_index()
+        if not self.index_complete:
+            # Built while the embedding service was down: scores would be noise
+            self._schedule_rebuild()
+            metrics.incr("degraded_routes", len(queries))
+            span.set(degraded=len(queries))
+            return [self.lexical.find_tools(query, threshold) for query in queries]
+        cache = self.semantic_cache
+        key = threshold
+        results: List[Optional[List[Dict[str, Any]]]] = [None] * len(queries)
+        probes: Dict[int, np.ndarray] = {}
+        
+        if cache is not None and self.local_embedder is not None:
+            for i, probe in enumerate(self.local_embedder.embed_many(queries)):
+                probes[i] = probe
+                results[i] = cache.lookup(probe, key)
+        
+        pending = [i for i, result in enumerate(results) if result is None]
+        degraded = 0
+        if pending:
+            budget = deadline - time.monotonic() if deadline is not None else None
+            embeddings = await self.embed_queries([queries[i] for i in pending], budget)
+            
+            if embeddings is None:
+                # No embedding in time: answer from the registry keywords instead
+                degraded = len(pending)
+                metrics.incr("degraded_routes", degraded)
+                span.set(degraded=degraded)
+                for i in pending:
+                    results[i] = self.lexical.find_tools(queries[i], threshold)
+                pending = []
+            elif cache is not None and self.local_embedder is None:
+                for j, i in enumerate(pending):
+                    probes[i] = embeddings[j]
+                    results[i] = cache.lookup(embeddings[j], key)
+                remaining = [j for j, i in enumerate(pending) if results[i] is None]
+                pending = [pending[j] for j in remaining]
+                embeddings = embeddings[remaining]
+        
+        if cache is not None:
+            hits = len(queries) - len(pending) - degraded
+            metrics.incr("semantic_cache_hits", hits)
+            metrics.incr("semantic_cache_misses", len(queries) - hits)
+            span.set(semantic_cache_hits=hits)
+        
+        if pending:
+            with metrics.timer(stage):
+                mcp_scores = self.mcp_embeddings.scores_batch(embeddings)
+                tool_scores = self.tool_embeddings.scores_batch(embeddings)
+                
+                for j, i in enumerate(pending):
+                    results[i] = self._matches(mcp_scores[j], tool_scores[j], threshold)
+                    # Keyword fallbacks never get here, so every result scored a real embedding
+                    if cache is not None:
+                        cache.store(probes[i], key, results[i])
+        
+        span.set(decisions=[
+            f"{result[0]['mcp']}::{result[0]['tool']}" if result else None
+            for result in results
+        ])
+        return results
+    
+    def _matches(self, 
+                 mcp_scores: np.ndarray, 
+                 tool_scores: np.ndarray, 
+                 threshold: float) -> List[Dict[str, Any]]:
+        """Turn per-MCP and per-tool scores into sorted, de-duplicated matches"""
         matches = []
         
         # Check MCP-level matches
-        for mcp_name, mcp_embedding in self.mcp_embeddings.items():
-            score = self.cosine_similarity(query_embedding, mcp_embedding)
-            
-            if score >= threshold:
-                mcp_config = self.registry["mcps"][mcp_name]
-                matches.append({
-                    "mcp": mcp_name,
-                    "tool": "*",  # All tools
-                    "confidence": score,
-                    "description": mcp_config.get("description", ""),
-                    "capabilities": mcp_config.get("capabilities", [])
-                })
+        for i in np.flatnonzero(mcp_scores >= threshold):
+            mcp_name = self.mcp_embeddings.keys[i]
+            mcp_config = self.registry["mcps"][mcp_name]
+            matches.append({
+                "mcp": mcp_name,
+                "tool": "*",  # All tools
+                "confidence": float(mcp_scores[i]),
+                "description": mcp_config.get("description", ""),
+                "capabilities": mcp_config.get("capabilities", [])
+            })
         
         # Check individual tool matches
-        for tool_key, tool_embedding in self.tool_embeddings.items():
-            score = self.cosine_similarity(query_embedding, tool_embedding)
+        for i in np.flatnonzero(tool_scores >= threshold):
+            mcp_name, tool_name = self.tool_embeddings.keys[i].split("::", 1)
+            tool_config = self.registry["mcps"][mcp_name]["tools"][tool_name]
             
-            if score >= threshold:
-                mcp_name, tool_name = tool_key.split("::", 1)
-                tool_config = self.registry["mcps"][mcp_name]["tools"][tool_name]
-                
-                matches.append({
-                    "mcp": mcp_name,
-                    "tool": tool_name,
-                    "confidence": score,
-                    "description": tool_config.get("description", ""),
-                    "capabilities": []
-                })
+            matches.append({
+                "mcp": mcp_name,
+                "tool": tool_name,
+                "confidence": float(tool_scores[i]),
+                "description": tool_config.get("description", ""),
+                "capabilities": []
+            })
         
         # Sort by confidence
         matches.sort(key=lambda x: x["confidence"], reverse=True)
@@ -166,15 +614,4 @@ class MCPOrchestrator:
     
     async def list_all_capabilities(self, category: Optional[str] = None) -> Dict[str, List[str]]:
         """List all available capabilities, optionally filtered"""
-        capabilities = {}
-        
-        for mcp_name, mcp_config in self.registry.get("mcps", {}).items():
-            # Filter by category if specified
-            if category:
-                keywords = mcp_config.get("keywords", [])
-                if category.lower() not in [k.lower() for k in keywords]:
-                    continue
-            
-            capabilities[mcp_name] = mcp_config.get("capabilities", [])
-        
-        return capabilities
\ No newline at end of file
+        return list_capabilities(self.registry, category)
@@ -0,0 +1,32 @@
+"""Registry loading shared by the orchestrator components"""
+
+import json
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+DEFAULT_REGISTRY = Path(__file__).parent.parent / "config" / "registry.json"
+
+def load_registry(registry_path: str = "config/registry.json") -> Dict[str, Any]:
+    """Load a registry file, falling back to the bundled default"""
+    registry_file = Path(registry_path)
+    if not registry_file.exists():
+        # Use default registry
+        registry_file = DEFAULT_REGISTRY
+
+    with open(registry_file, 'r') as f:
+        return json.load(f)
+
+def list_capabilities(registry: Dict[str, Any], category: Optional[str] = None) -> Dict[str, List[str]]:
+    """Map each MCP to its capabilities, optionally filtered by keyword category"""
+    capabilities = {}
+
+    for mcp_name, mcp_config in registry.get("mcps", {}).items():
+        # Filter by category if specified
+        if category:
+            keywords = mcp_config.get("keywords", [])
+            if category.lower() not in [k.lower() for k in keywords]:
+                continue
+
+        capabilities[mcp_name] = mcp_config.get("capabilities", [])
+
+    return capabilities
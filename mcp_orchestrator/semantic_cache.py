@@ -0,0 +1,100 @@
+"""Near-duplicate query cache for routing results"""
+
+import re
+import zlib
+import numpy as np
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+class HashingEmbedder:
+    """Cheap local embedder: hashed word unigrams and character trigrams.
+
+    Captures surface similarity only ("create a logo" ~ "create logo"), but
+    costs microseconds, so a cache hit can skip the remote embedding call.
+    """
+
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+
+    def embed(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for word in WORD_RE.findall(text.lower()):
+            features = [word] + [f"#{word[i:i + 3]}" for i in range(max(1, len(word) - 2))]
+            for feature in features:
+                h = zlib.crc32(feature.encode())
+                vector[h % self.dim] += 1.0 if h & 0x80000000 else -1.0
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def embed_many(self, texts: List[str]) -> List[np.ndarray]:
+        return [self.embed(text) for text in texts]
+
+class SemanticCache:
+    """Bounded ring of recent query vectors and their routing results.
+
+    A lookup hits when a stored vector with the same key lies within
+    ``max_distance`` cosine distance of the query vector.
+    """
+
+    def __init__(self, capacity: int = 512, max_distance: float = 0.05):
+        self.capacity = capacity
+        self.max_distance = max_distance
+        self.vectors: Optional[np.ndarray] = None
+        self.entries: List[Optional[Tuple[Hashable, Any]]] = [None] * capacity
+        self.size = 0
+        self.next = 0
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        """Drop all entries, e.g. after the registry changed"""
+        self.vectors = None
+        self.entries = [None] * self.capacity
+        self.size = 0
+        self.next = 0
+
+    def lookup(self, vector: np.ndarray, key: Hashable) -> Optional[Any]:
+        """Cached result for the nearest stored query with the same key"""
+        if self.size and self.vectors.shape[1] == len(vector):
+            similarities = self.vectors[:self.size] @ self._normalize(vector)
+            for i in np.argsort(-similarities):
+                if similarities[i] < 1.0 - self.max_distance:
+                    break
+                entry_key, result = self.entries[i]
+                if entry_key == key:
+                    self.hits += 1
+                    return result
+
+        self.misses += 1
+        return None
+
+    def store(self, vector: np.ndarray, key: Hashable, result: Any):
+        """Insert a result, overwriting the oldest entry when full"""
+        if not self.capacity:
+            return
+        if self.vectors is None or self.vectors.shape[1] != len(vector):
+            self.clear()
+            self.vectors = np.zeros((self.capacity, len(vector)), dtype=np.float32)
+
+        self.vectors[self.next] = self._normalize(vector)
+        self.entries[self.next] = (key, result)
+        self.next = (self.next + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": self.size,
+            "capacity": self.capacity,
+            "max_distance": self.max_distance,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+    @staticmethod
+    def _normalize(vector: np.ndarray) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
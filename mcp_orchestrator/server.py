@@ -1,29 +1,50 @@
 #!/usr/bin/env python3
 """MCP Orchestrator Server - Universal router for all MCPs"""
 
+import os
 import json
 import asyncio
 import logging
 from typing import Any, Dict, List, Optional
-from pathlib import Path
 
 import mcp.server.stdio
 import mcp.types as types
 from mcp.server import NotificationOptions, Server
 from mcp.server.models import InitializationOptions
 
-from .orchestrator import MCPOrchestrator
+from .loader import BackgroundOrchestrator
+from .connection import connection_pool
+from .metrics import metrics, METRICS_FILE, METRICS_DUMP_INTERVAL
+from .tracing import tracer, current_span
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Initialize components
-orchestrator = MCPOrchestrator()
-server = Server("mcp-orchestrator")
+# Initialize components. The routing index is built in the background once
+# main() starts, so importing this module stays cheap.
+orchestrator = BackgroundOrchestrator(
+    registry_path=os.environ.get("MCP_ORCHESTRATOR_REGISTRY", "config/registry.json"),
+    lm_studio_url=os.environ.get("MCP_ORCHESTRATOR_LM_STUDIO_URL", "http://127.0.0.1:1234"),
+    index_wait=float(os.environ.get("MCP_ORCHESTRATOR_INDEX_WAIT", "2.0")),
+    precision=os.environ.get("MCP_ORCHESTRATOR_PRECISION", "float32"),
+    shared_index=os.environ.get("MCP_ORCHESTRATOR_SHARED_INDEX") or None,
+    embedding_cache_size=int(os.environ.get("MCP_ORCHESTRATOR_EMBEDDING_CACHE", "4096")),
+    semantic_cache_size=int(os.environ.get("MCP_ORCHESTRATOR_SEMANTIC_CACHE", "512")),
+    semantic_cache_distance=float(os.environ.get("MCP_ORCHESTRATOR_SEMANTIC_DISTANCE", "0.05")),
+    semantic_cache_embedder=os.environ.get("MCP_ORCHESTRATOR_SEMANTIC_EMBEDDER", "remote"),
+    embedding_timeout=float(os.environ.get("MCP_ORCHESTRATOR_EMBEDDING_TIMEOUT", "5.0")),
+    max_embedding_requests=int(os.environ.get("MCP_ORCHESTRATOR_EMBEDDING_REQUESTS", "4"))
+)
+# Longest a routing call may take before answering from keywords; 0 disables
+ROUTING_BUDGET = float(os.environ.get("MCP_ORCHESTRATOR_ROUTING_BUDGET", "1.0")) or None
+# Matches shown per query by find_tool and find_tools_batch
+DEFAULT_TOP_K = 5
+SERVER_VERSION = "0.1.0"
+server = Server("mcp-orchestrator", version=SERVER_VERSION)
 
 @server.list_tools()
 async def handle_list_tools() -> list[types.Tool]:
-    """List the 4 orchestrator tools that replace 100+ individual tools"""
+    """List the orchestrator tools that replace 100+ individual tools"""
     return [
         types.Tool(
             name="find_tool",
@@ -44,6 +65,31 @@ async def handle_list_tools() -> list[types.Tool]:
                 "required": ["query"]
             }
         ),
+        types.Tool(
+            name="find_tools_batch",
+            description="Route several tasks at once, e.g. every step of a plan",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "queries": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Natural language descriptions, one per task"
+                    },
+                    "threshold": {
+                        "type": "number",
+                        "description": "Minimum confidence threshold (0-1)",
+                        "default": 0.5
+                    },
+                    "top_k": {
+                        "type": "integer",
+                        "description": "Maximum matches returned per query",
+                        "default": DEFAULT_TOP_K
+                    }
+                },
+                "required": ["queries"]
+            }
+        ),
         types.Tool(
             name="execute",
             description="Get routing info for executing any MCP tool by describing what you want to do",
@@ -92,6 +138,26 @@ async def handle_list_tools() -> list[types.Tool]:
                 },
                 "required": ["mcp_name", "tool_name"]
             }
+        ),
+        types.Tool(
+            name="stats",
+            description="Show orchestrator latency histograms and counters",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "format": {
+                        "type": "string",
+                        "enum": ["json", "prometheus"],
+                        "description": "Output format",
+                        "default": "json"
+                    },
+                    "reset": {
+                        "type": "boolean",
+                        "description": "Clear all recorded metrics after reporting",
+                        "default": False
+                    }
+                }
+            }
         )
     ]
 
@@ -100,12 +166,20 @@ async def handle_call_tool(
     name: str, arguments: Optional[Dict[str, Any]] = None
 ) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
     """Handle tool execution"""
+    metrics.incr("tool_calls")
+    with tracer.span("call_tool", tool=name), metrics.timer("call_tool"):
+        return await _call_tool(name, arguments or {})
+
+async def _call_tool(
+    name: str, arguments: Dict[str, Any]
+) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
+    """Dispatch an orchestrator tool call"""
     try:
         if name == "find_tool":
             query = arguments.get("query", "")
             threshold = arguments.get("threshold", 0.5)
             
-            results = await orchestrator.find_tools(query, threshold)
+            results = await orchestrator.find_tools(query, threshold, ROUTING_BUDGET)
             
             if not results:
                 return [types.TextContent(
@@ -114,20 +188,47 @@ async def handle_call_tool(
                 )]
             
             # Format results
-            output = "Found matching tools:\n\n"
-            for result in results[:5]:  # Top 5 matches
-                output += f"**{result['mcp']}** → {result['tool']}\n"
-                output += f"  Confidence: {result['confidence']:.2f}\n"
-                output += f"  Description: {result['description']}\n\n"
+            with metrics.timer("format_response"):
+                output = "Found matching tools:\n\n"
+                for result in results[:DEFAULT_TOP_K]:
+                    output += f"**{result['mcp']}** → {result['tool']}\n"
+                    output += f"  Confidence: {result['confidence']:.2f}\n"
+                    output += f"  Description: {result['description']}\n\n"
+                
+                if results[0].get("degraded"):
+                    output += "_Keyword match only: semantic routing is not available right now._\n"
             
             return [types.TextContent(type="text", text=output)]
             
+        elif name == "find_tools_batch":
+            queries = arguments.get("queries", [])
+            threshold = arguments.get("threshold", 0.5)
+            top_k = arguments.get("top_k", DEFAULT_TOP_K)
+            
+            batch = await orchestrator.find_tools_batch(queries, threshold, top_k, ROUTING_BUDGET)
+            
+            with metrics.timer("format_response"):
+                output = ""
+                for i, (query, results) in enumerate(zip(queries, batch), 1):
+                    output += f"**{i}. {query}**\n"
+                    if not results:
+                        output += "  No matching tools found.\n\n"
+                        continue
+                    for result in results:
+                        output += f"  {result['mcp']} → {result['tool']} ({result['confidence']:.2f})\n"
+                    output += "\n"
+                
+                if any(results and results[0].get("degraded") for results in batch):
+                    output += "_Keyword match only: semantic routing is not available right now._\n"
+            
+            return [types.TextContent(type="text", text=output or "No queries given.")]
+            
         elif name == "execute":
             request = arguments.get("request", "")
             params = arguments.get("params", {})
             
             # Find the best tool
-            results = await orchestrator.find_tools(request, threshold=0.6)
+            results = await orchestrator.find_tools(request, threshold=0.6, budget=ROUTING_BUDGET)
             if not results:
                 return [types.TextContent(
                     type="text",
@@ -167,10 +268,7 @@ async def handle_call_tool(
             tool_name = arguments["tool_name"]
             
             # Get tool info from registry
-            registry_path = Path(__file__).parent.parent / "config" / "registry.json"
-            with open(registry_path, 'r') as f:
-                registry = json.load(f)
-            
+            registry = await orchestrator.wait_registry()
             mcp_config = registry["mcps"].get(mcp_name, {})
             tools = mcp_config.get("tools", {})
             tool_config = tools.get(tool_name, {})
@@ -190,30 +288,77 @@ async def handle_call_tool(
             
             return [types.TextContent(type="text", text=doc)]
             
+        elif name == "stats":
+            if METRICS_FILE:
+                metrics.dump_prometheus(METRICS_FILE)
+            
+            if arguments.get("format") == "prometheus":
+                output = metrics.to_prometheus()
+            else:
+                snapshot = metrics.snapshot()
+                if orchestrator.orchestrator is not None:
+                    snapshot["index"] = orchestrator.orchestrator.describe_index()
+                if tracer.enabled:
+                    snapshot["tracing"] = tracer.describe()
+                admission = connection_pool.describe_admission()
+                if admission:
+                    snapshot["admission"] = admission
+                output = json.dumps(snapshot, indent=2)
+            
+            if arguments.get("reset"):
+                metrics.reset()
+            
+            return [types.TextContent(type="text", text=output)]
+            
         else:
             raise ValueError(f"Unknown tool: {name}")
     
     except Exception as e:
+        metrics.incr("tool_errors")
+        current_span().set(error=str(e))
         logger.error(f"Tool execution error: {str(e)}")
         return [types.TextContent(
             type="text",
             text=f"Error: {str(e)}"
         )]
 
+async def _dump_metrics_periodically(path: str, interval: float):
+    """Refresh the Prometheus text-format metrics file"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            metrics.dump_prometheus(path)
+        except OSError as e:
+            logger.error(f"Metrics dump error: {str(e)}")
+
+def initialization_options() -> InitializationOptions:
+    """Options announced to every client session"""
+    return InitializationOptions(
+        server_name="mcp-orchestrator",
+        server_version=SERVER_VERSION,
+        capabilities=server.get_capabilities(
+            notification_options=NotificationOptions(),
+            experimental_capabilities={},
+        ),
+    )
+
+def start_background_tasks():
+    """Start the index build and metrics dump; call from the running event loop"""
+    # Build the routing index off the event loop; the handshake does not wait for it
+    orchestrator.start()
+    
+    if METRICS_FILE:
+        asyncio.create_task(_dump_metrics_periodically(METRICS_FILE, METRICS_DUMP_INTERVAL))
+
 async def main():
     """Run the MCP Orchestrator server"""
+    start_background_tasks()
+    
     async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
         await server.run(
             read_stream,
             write_stream,
-            InitializationOptions(
-                server_name="mcp-orchestrator",
-                server_version="0.1.0",
-                capabilities=server.get_capabilities(
-                    notification_options=NotificationOptions(),
-                    experimental_capabilities={},
-                ),
-            ),
+            initialization_options(),
         )
 
 if __name__ == "__main__":
@@ -0,0 +1,174 @@
+"""Routing index shared between orchestrator processes on one host.
+
+One process publishes the compiled index (embedding matrices, keys and the
+registry it was built from) as a generation directory of ``.npy`` files.
+Other processes memory-map those files read-only, so every client shares
+the same pages instead of holding and recomputing a private copy.
+
+Layout under the store root::
+
+    CURRENT.<scope>         name of the newest generation for one scope
+    <generation>/meta.json  keys, precision, registry, creation time
+    <generation>/*.npy      matrices and int8 scales
+
+A scope is one registry file, embedding model and precision (see
+``index_scope``). Processes with different settings can share a root
+without switching each other to an index they did not ask for.
+Generations are written to a temporary directory and renamed into place,
+and the pointer is swapped with ``os.replace``, so readers never see a
+partial index.
+"""
+
+import os
+import json
+import time
+import shutil
+import hashlib
+import logging
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from .index import EmbeddingMatrix
+
+try:
+    import fcntl
+except ImportError:  # Windows: builders are not serialised, last rename wins
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+
+def index_fingerprint(registry: Dict[str, Any], embedding_model: str, precision: str) -> str:
+    """Content hash identifying an index built from these inputs"""
+    payload = json.dumps({
+        "format": FORMAT_VERSION,
+        "registry": registry,
+        "model": embedding_model,
+        "precision": precision
+    }, sort_keys=True).encode()
+    return hashlib.sha256(payload).hexdigest()[:24]
+
+def index_scope(registry_path: str, embedding_model: str, precision: str) -> str:
+    """Identifies processes that follow the same sequence of generations"""
+    payload = json.dumps({
+        "registry_path": os.path.abspath(os.path.expanduser(registry_path)),
+        "model": embedding_model,
+        "precision": precision
+    }, sort_keys=True).encode()
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+class SharedIndexStore:
+    """Publishes and attaches memory-mapped index generations"""
+
+    def __init__(self, root: str, keep_generations: int = 3, scope: Optional[str] = None):
+        self.root = Path(root).expanduser()
+        self.keep_generations = keep_generations
+        self.scope = scope
+        self.pointer = self.root / (f"CURRENT.{scope}" if scope else "CURRENT")
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def current(self) -> Optional[str]:
+        """Name of the newest generation published in this scope, if any"""
+        try:
+            name = self.pointer.read_text().strip()
+        except OSError:
+            return None
+        return name if name and (self.root / name / "meta.json").exists() else None
+
+    def exists(self, generation: str) -> bool:
+        return (self.root / generation / "meta.json").exists()
+
+    @contextmanager
+    def build_lock(self, generation: str):
+        """Serialise builders of one generation so only the first pays for it"""
+        if fcntl is None:
+            yield
+            return
+        with open(self.root / f".{generation}.lock", "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def publish(self,
+                generation: str,
+                registry: Dict[str, Any],
+                mcp_matrix: EmbeddingMatrix,
+                tool_matrix: EmbeddingMatrix):
+        """Write a generation and make it current"""
+        target = self.root / generation
+        if not target.exists():
+            tmp = Path(tempfile.mkdtemp(prefix=f".{generation}.", dir=self.root))
+            try:
+                meta = {
+                    "format": FORMAT_VERSION,
+                    "generation": generation,
+                    "created": time.time(),
+                    "registry": registry,
+                    "levels": {}
+                }
+                for level, matrix in (("mcps", mcp_matrix), ("tools", tool_matrix)):
+                    np.save(tmp / f"{level}.npy", np.ascontiguousarray(matrix.matrix))
+                    if matrix.scales is not None:
+                        np.save(tmp / f"{level}.scales.npy", matrix.scales)
+                    meta["levels"][level] = {
+                        "keys": matrix.keys,
+                        "precision": matrix.precision,
+                        "scales": matrix.scales is not None
+                    }
+                (tmp / "meta.json").write_text(json.dumps(meta))
+                os.rename(tmp, target)
+            except OSError:
+                shutil.rmtree(tmp, ignore_errors=True)
+                if not target.exists():
+                    raise
+
+        self._set_current(generation)
+        self._prune(keep=generation)
+        logger.info(f"Published shared routing index generation {generation}")
+
+    def attach(self, generation: str) -> Tuple[Dict[str, Any], EmbeddingMatrix, EmbeddingMatrix]:
+        """Memory-map a generation read-only; returns (registry, mcps, tools)"""
+        path = self.root / generation
+        meta = json.loads((path / "meta.json").read_text())
+
+        matrices = []
+        for level in ("mcps", "tools"):
+            info = meta["levels"][level]
+            matrix = np.load(path / f"{level}.npy", mmap_mode="r")
+            scales = np.load(path / f"{level}.scales.npy", mmap_mode="r") if info["scales"] else None
+            matrices.append(EmbeddingMatrix.from_arrays(info["keys"], matrix, info["precision"], scales))
+
+        return meta["registry"], matrices[0], matrices[1]
+
+    def _set_current(self, generation: str):
+        tmp = self.root / f".{self.pointer.name}.{os.getpid()}"
+        tmp.write_text(generation)
+        os.replace(tmp, self.pointer)
+
+    def _prune(self, keep: str):
+        """Remove the oldest generations beyond ``keep_generations``.
+
+        Generations that any scope's pointer still names are never removed.
+        """
+        in_use = {keep}
+        for pointer in self.root.glob("CURRENT*"):
+            try:
+                in_use.add(pointer.read_text().strip())
+            except OSError:
+                pass
+        generations = sorted(
+            (p for p in self.root.iterdir() if p.is_dir() and not p.name.startswith(".")),
+            key=lambda p: p.stat().st_mtime,
+            reverse=True
+        )
+        for path in generations[self.keep_generations:]:
+            if path.name not in in_use:
+                # Attached readers keep their mappings; on Windows removal may fail
+                shutil.rmtree(path, ignore_errors=True)
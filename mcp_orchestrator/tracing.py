@@ -0,0 +1,252 @@
+"""Span-based request tracing exported to a rotating local JSONL file.
+
+Spans nest through a context variable, so they follow a request across
+awaits and into ``asyncio.to_thread`` workers. The sampling decision is
+made once per trace at the root span; unsampled traces cost one random
+draw and hand out a shared no-op span. Finished traces are queued to a
+background thread that appends one JSON line per trace, rotating the
+file by size. When the queue is full traces are dropped, never awaited.
+"""
+
+import os
+import json
+import time
+import queue
+import random
+import logging
+import threading
+import contextvars
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_current = contextvars.ContextVar("mcp_orchestrator_span", default=None)
+
+class _NullSpan:
+    """Stand-in used when tracing is off or the trace was not sampled"""
+
+    trace_id = None
+    span_id = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+    def traceparent(self) -> Optional[str]:
+        return None
+
+NULL_SPAN = _NullSpan()
+
+class Span:
+    """A timed operation within a trace"""
+
+    __slots__ = ("tracer", "name", "trace_id", "span_id", "parent_id", "attrs",
+                 "start", "start_wall", "duration", "error", "spans", "token")
+
+    def __init__(self, tracer: "Tracer", name: str, parent: Optional["Span"], attrs: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.span_id = os.urandom(8).hex()
+        self.trace_id = parent.trace_id if parent else os.urandom(16).hex()
+        self.parent_id = parent.span_id if parent else None
+        # Finished spans of the whole trace, shared with the root
+        self.spans: List[Dict[str, Any]] = parent.spans if parent else []
+        self.attrs = attrs
+        self.error: Optional[str] = None
+        self.duration = 0.0
+        self.token = None
+
+    def __enter__(self):
+        self.start_wall = time.time()
+        self.start = time.perf_counter()
+        self.token = _current.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration = time.perf_counter() - self.start
+        _current.reset(self.token)
+        if exc is not None:
+            self.error = f"{exc_type.__name__}: {exc}"
+        self.spans.append(self.to_dict())
+        if self.parent_id is None:
+            self.tracer.export(self)
+        return False
+
+    def set(self, **attrs):
+        """Attach attributes to the span"""
+        self.attrs.update(attrs)
+
+    def traceparent(self) -> str:
+        """W3C traceparent header value for propagating this span"""
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_dict(self) -> Dict[str, Any]:
+        span = {
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": self.start_wall,
+            "duration_ms": self.duration * 1000,
+            # Copy: late work (e.g. an embedding past its budget) may still set attrs
+            "attrs": dict(self.attrs)
+        }
+        if self.error:
+            span["error"] = self.error
+        return span
+
+class TraceWriter:
+    """Background thread appending traces to a size-rotated JSONL file"""
+
+    def __init__(self, path: str, max_bytes: int = 10_000_000, backup_count: int = 3,
+                 queue_size: int = 10_000):
+        self.path = Path(path).expanduser()
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=queue_size)
+        self.dropped = 0
+        self.written = 0
+        self._thread = threading.Thread(target=self._run, name="trace-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, trace: Dict[str, Any]):
+        """Queue a trace without blocking; drops it if the writer is behind"""
+        try:
+            self.queue.put_nowait(trace)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self, timeout: float = 5.0):
+        """Wait until everything queued so far is on disk"""
+        deadline = time.monotonic() + timeout
+        while self.queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def _run(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        while True:
+            batch = [self.queue.get()]
+            # Drain whatever else is waiting into the same write
+            while len(batch) < 256:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            lines = []
+            for trace in batch:
+                try:
+                    lines.append(json.dumps(trace, default=str))
+                except Exception as e:
+                    # Drop only the trace that cannot be serialised
+                    self.dropped += 1
+                    logger.error(f"Trace encode error: {str(e)}")
+            try:
+                if lines:
+                    self._write("\n".join(lines) + "\n")
+                    self.written += len(lines)
+            except Exception as e:
+                self.dropped += len(lines)
+                logger.error(f"Trace write error: {str(e)}")
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    def _write(self, text: str):
+        if self.path.exists() and self.path.stat().st_size + len(text) > self.max_bytes:
+            self._rotate()
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(text)
+
+    def _rotate(self):
+        for i in range(self.backup_count - 1, 0, -1):
+            older = self.path.with_name(f"{self.path.name}.{i}")
+            if older.exists():
+                os.replace(older, self.path.with_name(f"{self.path.name}.{i + 1}"))
+        if self.backup_count > 0:
+            os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink()
+
+class Tracer:
+    """Creates spans and exports sampled traces"""
+
+    def __init__(self, writer: Optional[TraceWriter] = None, sample_rate: float = 1.0):
+        self.writer = writer
+        self.sample_rate = sample_rate
+
+    @property
+    def enabled(self) -> bool:
+        return self.writer is not None
+
+    def span(self, name: str, **attrs):
+        """Start a span under the current one, or a new (sampled) trace"""
+        if self.writer is None:
+            return NULL_SPAN
+        parent = _current.get()
+        if parent is None:
+            if random.random() >= self.sample_rate:
+                # Remember the decision so child spans stay no-ops
+                return _UnsampledRoot()
+        elif parent is NULL_SPAN:
+            return NULL_SPAN
+        return Span(self, name, parent, attrs)
+
+    def export(self, root: Span):
+        self.writer.submit({
+            "trace_id": root.trace_id,
+            "name": root.name,
+            "start": root.start_wall,
+            "duration_ms": root.duration * 1000,
+            "error": root.error,
+            # Copy: spans of background work started in this trace may still finish
+            "spans": list(root.spans)
+        })
+
+    def describe(self) -> Dict[str, Any]:
+        if self.writer is None:
+            return {"enabled": False}
+        return {
+            "enabled": True,
+            "path": str(self.writer.path),
+            "sample_rate": self.sample_rate,
+            "written": self.writer.written,
+            "dropped": self.writer.dropped,
+            "queued": self.writer.queue.qsize()
+        }
+
+class _UnsampledRoot(_NullSpan):
+    """Root of an unsampled trace: marks the context so children are skipped"""
+
+    __slots__ = ("token",)
+
+    def __enter__(self):
+        self.token = _current.set(NULL_SPAN)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _current.reset(self.token)
+        return False
+
+def current_span():
+    """The active span, or the no-op span outside any trace"""
+    return _current.get() or NULL_SPAN
+
+def _tracer_from_env() -> Tracer:
+    path = os.environ.get("MCP_ORCHESTRATOR_TRACE_FILE")
+    if not path:
+        return Tracer()
+    writer = TraceWriter(
+        path,
+        max_bytes=int(os.environ.get("MCP_ORCHESTRATOR_TRACE_MAX_BYTES", "10000000")),
+        backup_count=int(os.environ.get("MCP_ORCHESTRATOR_TRACE_BACKUPS", "3"))
+    )
+    return Tracer(writer, float(os.environ.get("MCP_ORCHESTRATOR_TRACE_SAMPLE", "1.0")))
+
+# Global tracer. Enable with MCP_ORCHESTRATOR_TRACE_FILE=/path/traces.jsonl
+tracer = _tracer_from_env()
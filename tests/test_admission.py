@@ -0,0 +1,178 @@
+import asyncio
+
+import pytest
+
+from mcp_orchestrator.connection import AdmissionGate, MCPOverloaded
+
+async def settle():
+    """Let every runnable task get as far as its next real wait"""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+def waiter(gate, priority, order, label):
+    async def run():
+        await gate.acquire(priority)
+        order.append(label)
+    return asyncio.ensure_future(run())
+
+@pytest.mark.asyncio
+async def test_admits_up_to_max_concurrent_without_waiting():
+    gate = AdmissionGate("child", max_concurrent=2)
+    await gate.acquire()
+    await gate.acquire()
+    assert gate.in_flight == 2
+    assert gate.waiters == []
+
+@pytest.mark.asyncio
+async def test_interactive_waiters_go_before_batch_ones():
+    gate = AdmissionGate("child", max_concurrent=1)
+    await gate.acquire()
+    order = []
+    tasks = [
+        waiter(gate, "batch", order, "batch-1"),
+        waiter(gate, "interactive", order, "interactive-1"),
+        waiter(gate, "batch", order, "batch-2"),
+        waiter(gate, "interactive", order, "interactive-2"),
+    ]
+    await settle()
+
+    for _ in tasks:
+        gate.release()
+        await settle()
+
+    assert order == ["interactive-1", "interactive-2", "batch-1", "batch-2"]
+    assert gate.in_flight == 1
+
+@pytest.mark.asyncio
+async def test_full_queue_rejects_with_retry_after():
+    gate = AdmissionGate("child", max_concurrent=1, max_queue=1, min_retry_after=0.5)
+    await gate.acquire()
+    queued = waiter(gate, "interactive", [], "queued")
+    await settle()
+
+    with pytest.raises(MCPOverloaded) as info:
+        await gate.acquire("interactive")
+    assert info.value.reason == "queue full"
+    assert info.value.retry_after >= 0.5
+    assert gate.rejected == 1
+
+    gate.release()
+    await queued
+
+@pytest.mark.asyncio
+async def test_interactive_arrival_sheds_newest_batch_waiter():
+    gate = AdmissionGate("child", max_concurrent=1, max_queue=2)
+    await gate.acquire()
+    order = []
+    oldest = waiter(gate, "batch", order, "batch-old")
+    newest = waiter(gate, "batch", order, "batch-new")
+    await settle()
+
+    urgent = waiter(gate, "interactive", order, "interactive")
+    await settle()
+
+    with pytest.raises(MCPOverloaded) as info:
+        await newest
+    assert "shed" in info.value.reason
+    assert gate.shed == 1
+
+    gate.release()
+    await settle()
+    gate.release()
+    await asyncio.gather(oldest, urgent)
+    assert order == ["interactive", "batch-old"]
+
+@pytest.mark.asyncio
+async def test_batch_arrival_does_not_shed_and_is_rejected():
+    gate = AdmissionGate("child", max_concurrent=1, max_queue=1)
+    await gate.acquire()
+    queued = waiter(gate, "batch", [], "queued")
+    await settle()
+
+    with pytest.raises(MCPOverloaded):
+        await gate.acquire("batch")
+    assert gate.shed == 0
+
+    gate.release()
+    await queued
+
+@pytest.mark.asyncio
+async def test_queue_timeout_rejects_and_leaves_queue():
+    gate = AdmissionGate("child", max_concurrent=1, queue_timeout=0.01)
+    await gate.acquire()
+
+    with pytest.raises(MCPOverloaded) as info:
+        await gate.acquire()
+    assert info.value.reason == "queue timeout"
+    assert gate.waiters == []
+
+    gate.release()
+    assert gate.in_flight == 0
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_queue():
+    gate = AdmissionGate("child", max_concurrent=1)
+    await gate.acquire()
+    task = waiter(gate, "interactive", [], "cancelled")
+    await settle()
+
+    task.cancel()
+    await settle()
+    assert task.cancelled()
+    assert gate.waiters == []
+
+    gate.release()
+    assert gate.in_flight == 0
+
+@pytest.mark.asyncio
+async def test_waiter_cancelled_after_grant_passes_slot_on():
+    gate = AdmissionGate("child", max_concurrent=1)
+    await gate.acquire()
+    order = []
+    first = waiter(gate, "interactive", order, "first")
+    second = waiter(gate, "interactive", order, "second")
+    await settle()
+
+    # Grant the slot to the first waiter, then cancel it before it resumes
+    gate.release()
+    first.cancel()
+    await settle()
+
+    assert first.cancelled()
+    await second
+    assert order == ["second"]
+    assert gate.in_flight == 1
+
+@pytest.mark.asyncio
+async def test_unknown_priority_is_rejected():
+    gate = AdmissionGate("child", max_concurrent=1)
+    with pytest.raises(ValueError):
+        await gate.acquire("urgent")
+
+def test_from_config_requires_max_concurrent():
+    assert AdmissionGate.from_config("child", {}) is None
+    gate = AdmissionGate.from_config("child", {"max_concurrent": 2, "max_queue": 8, "queue_timeout": 1.5})
+    assert (gate.max_concurrent, gate.max_queue, gate.queue_timeout) == (2, 8, 1.5)
+
+@pytest.mark.asyncio
+async def test_timed_out_waiter_is_not_shed_and_frees_its_place():
+    gate = AdmissionGate("child", max_concurrent=1, max_queue=1, queue_timeout=0.05)
+    await gate.acquire()
+    stale = waiter(gate, "batch", [], "stale")
+    await settle()
+
+    # The batch waiter's timeout fires, but it has not run its handler yet
+    await asyncio.sleep(0.0501)
+    arrival = asyncio.ensure_future(gate.acquire("interactive"))
+    await settle()
+
+    with pytest.raises(MCPOverloaded) as info:
+        await stale
+    assert info.value.reason == "queue timeout"
+    assert gate.shed == 0
+    assert not arrival.done()
+
+    gate.release()
+    await arrival
+    assert gate.in_flight == 1
+    assert gate.waiters == []
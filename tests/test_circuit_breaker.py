@@ -0,0 +1,86 @@
+import pytest
+
+from mcp_orchestrator import circuit_breaker
+from mcp_orchestrator.circuit_breaker import CircuitBreaker
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", clock.monotonic)
+    return clock
+
+def tripped(clock, threshold=3, reset=10.0):
+    breaker = CircuitBreaker(failure_threshold=threshold, reset_timeout=reset)
+    for _ in range(threshold):
+        breaker.record_failure()
+    return breaker
+
+def test_stays_closed_below_threshold(clock):
+    breaker = CircuitBreaker(failure_threshold=3)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    assert breaker.allow()
+
+def test_success_resets_consecutive_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=3)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    assert breaker.failures == 1
+
+def test_opens_at_threshold_and_refuses_calls(clock):
+    breaker = tripped(clock)
+    assert breaker.state == "open"
+    assert not breaker.allow()
+    assert breaker.trips == 1
+
+def test_half_open_after_reset_timeout_lets_one_probe_through(clock):
+    breaker = tripped(clock, reset=10.0)
+    clock.now += 9.9
+    assert breaker.state == "open"
+    clock.now += 0.2
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()
+
+def test_successful_probe_closes(clock):
+    breaker = tripped(clock)
+    clock.now += 10.0
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.allow()
+    assert breaker.describe() == {"state": "closed", "consecutive_failures": 0, "trips": 1}
+
+def test_failed_probe_reopens_for_a_full_period(clock):
+    breaker = tripped(clock, reset=10.0)
+    clock.now += 10.0
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    clock.now += 9.9
+    assert not breaker.allow()
+    clock.now += 0.2
+    assert breaker.allow()
+    # Re-opening from a probe is the same trip, not a new one
+    assert breaker.trips == 1
+
+def test_trips_counts_each_time_it_opens_from_closed(clock):
+    breaker = tripped(clock)
+    clock.now += 10.0
+    breaker.allow()
+    breaker.record_success()
+    for _ in range(3):
+        breaker.record_failure()
+    assert breaker.state == "open"
+    assert breaker.trips == 2
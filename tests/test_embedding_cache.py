@@ -0,0 +1,43 @@
+import numpy as np
+
+from mcp_orchestrator.embedding_cache import EmbeddingCache
+
+def vector(value):
+    return np.full(4, value, dtype=np.float32)
+
+def test_get_returns_stored_vector():
+    cache = EmbeddingCache(capacity=2)
+    cache.put("a", vector(1))
+    assert "a" in cache
+    assert np.array_equal(cache.get("a"), vector(1))
+    assert cache.get("b") is None
+
+def test_evicts_least_recently_used():
+    cache = EmbeddingCache(capacity=2)
+    cache.put("a", vector(1))
+    cache.put("b", vector(2))
+    cache.get("a")
+    cache.put("c", vector(3))
+    assert "a" in cache and "c" in cache
+    assert "b" not in cache
+    assert cache.evictions == 1
+
+def test_overwriting_does_not_evict():
+    cache = EmbeddingCache(capacity=2)
+    cache.put("a", vector(1))
+    cache.put("b", vector(2))
+    cache.put("a", vector(3))
+    assert len(cache) == 2
+    assert cache.evictions == 0
+    assert np.array_equal(cache.get("a"), vector(3))
+
+def test_zero_capacity_stores_nothing():
+    cache = EmbeddingCache(capacity=0)
+    cache.put("a", vector(1))
+    assert len(cache) == 0
+
+def test_stats():
+    cache = EmbeddingCache(capacity=1)
+    cache.put("a", vector(1))
+    cache.put("b", vector(2))
+    assert cache.stats() == {"entries": 1, "capacity": 1, "bytes": 16, "evictions": 1}
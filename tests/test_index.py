@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from mcp_orchestrator import index
+from mcp_orchestrator.index import EmbeddingMatrix, measure_recall
+
+@pytest.fixture
+def vectors():
+    return np.random.default_rng(0).standard_normal((300, 64))
+
+@pytest.fixture
+def queries():
+    return np.random.default_rng(1).standard_normal((8, 64))
+
+def cosine(vectors, queries):
+    vectors = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    queries = queries / np.linalg.norm(queries, axis=1, keepdims=True)
+    return queries @ vectors.T
+
+def keys(n):
+    return [f"key{i}" for i in range(n)]
+
+@pytest.mark.parametrize("precision, tolerance", [
+    ("float64", 1e-12), ("float32", 1e-5), ("float16", 2e-3), ("int8", 2e-2)
+])
+def test_scores_match_exact_cosine(vectors, queries, precision, tolerance):
+    matrix = EmbeddingMatrix(keys(len(vectors)), vectors, precision)
+    assert np.abs(matrix.scores_batch(queries) - cosine(vectors, queries)).max() < tolerance
+    assert np.allclose(matrix.scores(queries[0]), matrix.scores_batch(queries)[0], atol=1e-6)
+
+@pytest.mark.parametrize("precision", ["float16", "int8"])
+def test_blocked_scoring_matches_single_block(vectors, queries, precision, monkeypatch):
+    matrix = EmbeddingMatrix(keys(len(vectors)), vectors, precision)
+    whole = matrix.scores_batch(queries)
+    # 300 rows in blocks of 64, the last one partial
+    monkeypatch.setattr(index, "SCORE_BLOCK_ROWS", 64)
+    assert np.allclose(matrix.scores_batch(queries), whole, atol=1e-6)
+
+def test_compact_precisions_shrink_storage(vectors):
+    sizes = {p: EmbeddingMatrix(keys(len(vectors)), vectors, p).nbytes for p in ("float32", "float16", "int8")}
+    assert sizes["float16"] == sizes["float32"] // 2
+    # int8 rows plus one float32 scale per row
+    assert sizes["int8"] == len(vectors) * (64 + 4)
+
+def test_zero_rows_and_queries_score_zero():
+    matrix = EmbeddingMatrix(["zero", "one"], [[0.0, 0.0], [1.0, 0.0]], "int8")
+    assert np.allclose(matrix.scores(np.array([1.0, 0.0])), [0.0, 1.0], atol=1e-2)
+    assert np.allclose(matrix.scores(np.zeros(2)), 0.0)
+
+def test_empty_matrix_scores_nothing():
+    matrix = EmbeddingMatrix([], [], "float16")
+    assert matrix.scores_batch(np.ones((2, 4))).shape == (2, 0)
+
+def test_unknown_precision_is_rejected(vectors):
+    with pytest.raises(ValueError):
+        EmbeddingMatrix(keys(len(vectors)), vectors, "int4")
+
+def test_measure_recall_is_exact_for_float32(vectors, queries):
+    matrix = EmbeddingMatrix(keys(len(vectors)), vectors, "float32")
+    result = measure_recall(vectors, matrix, queries, k=10)
+    assert result["k"] == 10
+    assert result["recall"] == 1.0
+    assert result["recall_delta"] == 0.0
+    assert result["max_score_error"] < 1e-5
+
+def test_measure_recall_reports_quantization_loss(vectors, queries):
+    matrix = EmbeddingMatrix(keys(len(vectors)), vectors, "int8")
+    result = measure_recall(vectors, matrix, queries, k=10)
+    assert 0.8 <= result["recall"] <= 1.0
+    assert result["recall_delta"] == result["recall"] - 1.0
+    assert 0.0 < result["max_score_error"] < 2e-2
+
+def test_measure_recall_caps_k_at_rows():
+    vectors = np.eye(3)
+    matrix = EmbeddingMatrix(keys(3), vectors, "float16")
+    assert measure_recall(vectors, matrix, vectors, k=10)["k"] == 3
+    assert measure_recall(np.empty((0, 3)), EmbeddingMatrix([], [], "float16"), vectors)["k"] == 0
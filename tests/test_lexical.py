@@ -0,0 +1,54 @@
+from mcp_orchestrator.lexical import LexicalIndex, tokenize
+
+REGISTRY = {
+    "mcps": {
+        "docker": {
+            "description": "Docker container management",
+            "capabilities": ["list containers"],
+            "keywords": ["docker", "container"],
+            "tools": {
+                "list_containers": {"description": "List Docker containers", "examples": ["docker ps"]},
+                "container_logs": {"description": "Get container logs", "examples": ["show logs"]}
+            }
+        },
+        "github": {
+            "description": "GitHub repository management",
+            "capabilities": ["pull requests"],
+            "keywords": ["git", "repository"],
+            "tools": {
+                "push_files": {"description": "Push files to a repository", "examples": ["push code"]}
+            }
+        }
+    }
+}
+
+def test_tokenize_drops_stopwords_and_plural_s():
+    assert tokenize("Show me the containers, please") == {"show", "container"}
+    assert tokenize("access class") == {"access", "class"}
+
+def test_results_are_marked_degraded():
+    matches = LexicalIndex(REGISTRY).find_tools("show container logs")
+    assert matches
+    assert all(match["degraded"] for match in matches)
+
+def test_best_match_first_and_tools_before_mcps_on_ties():
+    matches = LexicalIndex(REGISTRY).find_tools("show container logs")
+    assert (matches[0]["mcp"], matches[0]["tool"]) == ("docker", "container_logs")
+    assert matches[0]["confidence"] == 1.0
+
+    tied = LexicalIndex(REGISTRY).find_tools("docker containers")
+    assert tied[0]["confidence"] == tied[1]["confidence"] == 1.0
+    assert tied[0]["tool"] != "*"
+
+def test_mcp_entries_carry_capabilities():
+    matches = LexicalIndex(REGISTRY).find_tools("pull requests", threshold=1.0)
+    assert [(m["mcp"], m["tool"]) for m in matches] == [("github", "*")]
+    assert matches[0]["capabilities"] == ["pull requests"]
+
+def test_threshold_filters_partial_matches():
+    index = LexicalIndex(REGISTRY)
+    assert index.find_tools("push code somewhere else", threshold=0.9) == []
+    assert index.find_tools("push code somewhere else", threshold=0.5)
+
+def test_query_of_only_stopwords_matches_nothing():
+    assert LexicalIndex(REGISTRY).find_tools("can you please do it") == []
@@ -0,0 +1,63 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from mcp_orchestrator.orchestrator import MCPOrchestrator
+from mcp_orchestrator.semantic_cache import HashingEmbedder
+
+REGISTRY = str(Path(__file__).resolve().parent.parent / "config" / "registry.json")
+
+class FakeEndpoint:
+    """Stands in for the remote /v1/embeddings call and records each request"""
+
+    def __init__(self):
+        self.embedder = HashingEmbedder(dim=64)
+        self.requests = []
+
+    def __call__(self, texts, slow_after=None):
+        self.requests.append(list(texts))
+        return np.stack([self.embedder.embed(text) for text in texts])
+
+@pytest.fixture
+def endpoint(monkeypatch):
+    endpoint = FakeEndpoint()
+    monkeypatch.setattr(MCPOrchestrator, "_request_embeddings", endpoint)
+    return endpoint
+
+@pytest.fixture
+def orchestrator(endpoint):
+    orchestrator = MCPOrchestrator(REGISTRY, "http://127.0.0.1:1", semantic_cache_size=0)
+    endpoint.requests.clear()
+    return orchestrator
+
+@pytest.mark.asyncio
+async def test_batch_sends_one_request_for_unique_uncached_queries(orchestrator, endpoint):
+    queries = ["push code to github", "list docker containers", "push code to github"]
+    results = await orchestrator.find_tools_batch(queries, threshold=0.0)
+
+    assert endpoint.requests == [["push code to github", "list docker containers"]]
+    assert len(results) == 3
+    assert results[0] == results[2]
+
+@pytest.mark.asyncio
+async def test_batch_requests_only_uncached_queries(orchestrator, endpoint):
+    await orchestrator.find_tools_batch(["push code to github"], threshold=0.0)
+    await orchestrator.find_tools_batch(["push code to github", "read a file"], threshold=0.0)
+    await orchestrator.find_tools_batch(["read a file", "push code to github"], threshold=0.0)
+
+    assert endpoint.requests == [["push code to github"], ["read a file"]]
+
+@pytest.mark.asyncio
+async def test_batch_matches_single_query_routing(orchestrator):
+    queries = ["generate an image of a cat", "read a file"]
+    batch = await orchestrator.find_tools_batch(queries, threshold=0.0, top_k=3)
+    for query, results in zip(queries, batch):
+        single = (await orchestrator.find_tools(query, threshold=0.0))[:3]
+        assert [(r["mcp"], r["tool"]) for r in results] == [(r["mcp"], r["tool"]) for r in single]
+        assert [r["confidence"] for r in results] == pytest.approx([r["confidence"] for r in single])
+
+@pytest.mark.asyncio
+async def test_empty_batch_sends_nothing(orchestrator, endpoint):
+    assert await orchestrator.find_tools_batch([]) == []
+    assert endpoint.requests == []
@@ -0,0 +1,76 @@
+import numpy as np
+
+from mcp_orchestrator.semantic_cache import HashingEmbedder, SemanticCache
+
+def unit(*values):
+    return np.array(values, dtype=np.float32)
+
+def test_hit_within_distance():
+    cache = SemanticCache(capacity=4, max_distance=0.05)
+    cache.store(unit(1.0, 0.0, 0.0), "key", "result")
+    assert cache.lookup(unit(1.0, 0.1, 0.0), "key") == "result"
+    # Scale does not matter, only direction
+    assert cache.lookup(unit(5.0, 0.0, 0.0), "key") == "result"
+
+def test_miss_beyond_distance():
+    cache = SemanticCache(capacity=4, max_distance=0.05)
+    cache.store(unit(1.0, 0.0, 0.0), "key", "result")
+    assert cache.lookup(unit(1.0, 1.0, 0.0), "key") is None
+
+def test_miss_on_different_key():
+    cache = SemanticCache(capacity=4)
+    cache.store(unit(1.0, 0.0), ("query", 0.5, 5), "result")
+    assert cache.lookup(unit(1.0, 0.0), ("query", 0.7, 5)) is None
+
+def test_nearest_entry_with_matching_key_wins():
+    cache = SemanticCache(capacity=4, max_distance=0.2)
+    cache.store(unit(1.0, 0.0), "other", "wrong key")
+    cache.store(unit(1.0, 0.3), "key", "farther")
+    cache.store(unit(1.0, 0.1), "key", "nearer")
+    assert cache.lookup(unit(1.0, 0.0), "key") == "nearer"
+
+def test_oldest_entry_is_overwritten_when_full():
+    cache = SemanticCache(capacity=2, max_distance=0.01)
+    cache.store(unit(1.0, 0.0, 0.0), "key", "a")
+    cache.store(unit(0.0, 1.0, 0.0), "key", "b")
+    cache.store(unit(0.0, 0.0, 1.0), "key", "c")
+    assert cache.size == 2
+    assert cache.lookup(unit(1.0, 0.0, 0.0), "key") is None
+    assert cache.lookup(unit(0.0, 1.0, 0.0), "key") == "b"
+    assert cache.lookup(unit(0.0, 0.0, 1.0), "key") == "c"
+
+def test_clear_drops_entries():
+    cache = SemanticCache(capacity=4)
+    cache.store(unit(1.0, 0.0), "key", "result")
+    cache.clear()
+    assert cache.size == 0
+    assert cache.lookup(unit(1.0, 0.0), "key") is None
+
+def test_dimension_change_starts_over():
+    cache = SemanticCache(capacity=4)
+    cache.store(unit(1.0, 0.0), "key", "2d")
+    assert cache.lookup(unit(1.0, 0.0, 0.0), "key") is None
+    cache.store(unit(1.0, 0.0, 0.0), "key", "3d")
+    assert cache.size == 1
+    assert cache.lookup(unit(1.0, 0.0, 0.0), "key") == "3d"
+
+def test_zero_capacity_stores_nothing():
+    cache = SemanticCache(capacity=0)
+    cache.store(unit(1.0, 0.0), "key", "result")
+    assert cache.lookup(unit(1.0, 0.0), "key") is None
+
+def test_stats_count_hits_and_misses():
+    cache = SemanticCache(capacity=4)
+    cache.store(unit(1.0, 0.0), "key", "result")
+    cache.lookup(unit(1.0, 0.0), "key")
+    cache.lookup(unit(0.0, 1.0), "key")
+    stats = cache.stats()
+    assert (stats["entries"], stats["hits"], stats["misses"]) == (1, 1, 1)
+    assert stats["hit_rate"] == 0.5
+
+def test_hashing_embedder_matches_surface_rephrasings():
+    embedder = HashingEmbedder()
+    cache = SemanticCache(capacity=4, max_distance=0.3)
+    cache.store(embedder.embed("create a logo"), "key", "result")
+    assert cache.lookup(embedder.embed("Create logo"), "key") == "result"
+    assert cache.lookup(embedder.embed("search the web for news"), "key") is None
@@ -0,0 +1,103 @@
+import os
+
+import numpy as np
+
+from mcp_orchestrator.index import EmbeddingMatrix
+from mcp_orchestrator.shared_index import SharedIndexStore, index_fingerprint, index_scope
+
+MODEL = "test-model"
+REGISTRY = {"mcps": {"docker": {"tools": {"list_containers": {}}}}}
+
+def matrices(precision="int8", seed=0):
+    rng = np.random.default_rng(seed)
+    mcps = EmbeddingMatrix(["docker"], rng.standard_normal((1, 16)), precision)
+    tools = EmbeddingMatrix(["docker::list_containers", "docker::logs"], rng.standard_normal((2, 16)), precision)
+    return mcps, tools
+
+def publish(store, name, seed=0):
+    store.publish(name, REGISTRY, *matrices(seed=seed))
+    # Distinct modification times, oldest first, whatever the filesystem's resolution
+    stamp = 1_000_000 + seed
+    os.utime(store.root / name, (stamp, stamp))
+
+def test_publish_then_attach_round_trips(tmp_path):
+    store = SharedIndexStore(str(tmp_path), scope="a")
+    mcps, tools = matrices()
+    store.publish("gen1", REGISTRY, mcps, tools)
+
+    registry, attached_mcps, attached_tools = store.attach("gen1")
+    assert registry == REGISTRY
+    assert attached_tools.keys == tools.keys
+    assert attached_tools.precision == "int8"
+    assert isinstance(attached_tools.matrix, np.memmap)
+    assert not attached_tools.matrix.flags.writeable
+    query = np.random.default_rng(1).standard_normal(16)
+    assert np.allclose(attached_tools.scores(query), tools.scores(query))
+    assert np.allclose(attached_mcps.scores(query), mcps.scores(query))
+
+def test_current_follows_the_scope_pointer(tmp_path):
+    store = SharedIndexStore(str(tmp_path), scope="a")
+    assert store.current() is None
+    store.publish("gen1", REGISTRY, *matrices())
+    assert store.current() == "gen1"
+    assert (tmp_path / "CURRENT.a").read_text() == "gen1"
+    assert store.exists("gen1")
+
+def test_scopes_do_not_switch_each_other(tmp_path):
+    first = SharedIndexStore(str(tmp_path), scope="a")
+    second = SharedIndexStore(str(tmp_path), scope="b")
+    first.publish("gen-a", REGISTRY, *matrices())
+    second.publish("gen-b", REGISTRY, *matrices(seed=1))
+    assert first.current() == "gen-a"
+    assert second.current() == "gen-b"
+
+def test_pointer_to_missing_generation_is_ignored(tmp_path):
+    store = SharedIndexStore(str(tmp_path), scope="a")
+    store.pointer.write_text("gone")
+    assert store.current() is None
+
+def test_publishing_an_existing_generation_only_repoints(tmp_path):
+    store = SharedIndexStore(str(tmp_path), scope="a")
+    store.publish("gen1", REGISTRY, *matrices())
+    store.publish("gen2", REGISTRY, *matrices(seed=1))
+    store.publish("gen1", REGISTRY, *matrices(seed=2))
+    assert store.current() == "gen1"
+    query = np.ones(16)
+    assert np.allclose(store.attach("gen1")[2].scores(query), matrices()[1].scores(query))
+
+def test_prune_keeps_newest_generations(tmp_path):
+    store = SharedIndexStore(str(tmp_path), keep_generations=2, scope="a")
+    for seed, name in enumerate(["gen0", "gen1", "gen2", "gen3"]):
+        publish(store, name, seed)
+    store._prune(keep="gen3")
+    assert sorted(p.name for p in tmp_path.iterdir() if p.is_dir()) == ["gen2", "gen3"]
+
+def test_prune_never_removes_a_generation_another_scope_uses(tmp_path):
+    other = SharedIndexStore(str(tmp_path), scope="b")
+    publish(other, "gen-b", 0)
+    store = SharedIndexStore(str(tmp_path), keep_generations=1, scope="a")
+    for seed, name in enumerate(["gen1", "gen2", "gen3"], start=1):
+        publish(store, name, seed)
+    store._prune(keep="gen3")
+    assert sorted(p.name for p in tmp_path.iterdir() if p.is_dir()) == ["gen-b", "gen3"]
+    assert other.current() == "gen-b"
+
+def test_fingerprint_changes_with_inputs():
+    base = index_fingerprint(REGISTRY, MODEL, "int8")
+    assert index_fingerprint(REGISTRY, MODEL, "int8") == base
+    assert index_fingerprint(REGISTRY, MODEL, "float32") != base
+    assert index_fingerprint(REGISTRY, "other-model", "int8") != base
+    assert index_fingerprint({"mcps": {}}, MODEL, "int8") != base
+
+def test_scope_depends_on_resolved_registry_path(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    scope = index_scope("registry.json", MODEL, "int8")
+    assert index_scope(str(tmp_path / "registry.json"), MODEL, "int8") == scope
+    assert index_scope("other.json", MODEL, "int8") != scope
+    assert index_scope("registry.json", MODEL, "float16") != scope
+
+def test_unscoped_store_uses_plain_pointer(tmp_path):
+    store = SharedIndexStore(str(tmp_path))
+    store.publish("gen1", REGISTRY, *matrices())
+    assert (tmp_path / "CURRENT").read_text() == "gen1"
+    assert store.current() == "gen1"